@@ -0,0 +1,45 @@
+"""store refresh tokens as sha256 hashes
+
+Revision ID: 0003_hash_refresh_tokens
+Revises: 0002_create_refresh_tokens
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_hash_refresh_tokens"
+down_revision = "0002_create_refresh_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "refresh_tokens", sa.Column("token_hash", sa.String(64), nullable=True)
+    )
+    # hash existing tokens in place so live sessions survive the migration
+    op.execute(
+        "UPDATE refresh_tokens "
+        "SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+    op.alter_column("refresh_tokens", "token_hash", nullable=False)
+    op.create_index(
+        "ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], unique=True
+    )
+    # drops its unique constraint and index along with it
+    op.drop_column("refresh_tokens", "token")
+
+
+def downgrade() -> None:
+    # raw tokens cannot be recovered from their hashes: revoke every session
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index("ix_refresh_tokens_token_hash", table_name="refresh_tokens")
+    op.drop_column("refresh_tokens", "token_hash")
+    op.add_column(
+        "refresh_tokens", sa.Column("token", sa.String(255), nullable=False)
+    )
+    op.create_index(
+        "ix_refresh_tokens_token", "refresh_tokens", ["token"], unique=True
+    )
@@ -0,0 +1,47 @@
+"""composite (user_id, expires_at) index on refresh_tokens
+
+Revision ID: 0004_rt_user_expiry_index
+Revises: 0003_hash_refresh_tokens
+Create Date: 2026-10-17 00:00:00.000001
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004_rt_user_expiry_index"
+down_revision = "0003_hash_refresh_tokens"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; it avoids blocking
+    # logins/refreshes while the index builds on a large table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_tokens_user_id_expires_at",
+            "refresh_tokens",
+            ["user_id", "expires_at"],
+            postgresql_concurrently=True,
+        )
+        # the composite index's leading column covers user_id lookups
+        op.drop_index(
+            "ix_refresh_tokens_user_id",
+            table_name="refresh_tokens",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_tokens_user_id",
+            "refresh_tokens",
+            ["user_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_refresh_tokens_user_id_expires_at",
+            table_name="refresh_tokens",
+            postgresql_concurrently=True,
+        )
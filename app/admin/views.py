@@ -1,5 +1,9 @@
+from typing import Any
+
 from sqladmin import ModelView
+from starlette.requests import Request
 
+from app.core.cache import principal_cache
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
 
@@ -37,13 +41,23 @@ class UserAdmin(ModelView, model=User):
     # Default ordering
     column_default_sort = [(User.id, True)]  # descending
 
+    # Edits made here bypass UserService, so drop cached principals too —
+    # otherwise a user deactivated in the admin keeps access until TTL.
+    async def after_model_change(
+        self, data: dict, model: Any, is_created: bool, request: Request
+    ) -> None:
+        principal_cache.invalidate(model.id)
+
+    async def after_model_delete(self, model: Any, request: Request) -> None:
+        principal_cache.invalidate(model.id)
+
 
 class RefreshTokenAdmin(ModelView, model=RefreshToken):
     name = "Refresh Token"
     name_plural = "Refresh Tokens"
     icon = "fa-solid fa-key"
 
-    # token value is intentionally omitted — must never be visible in admin
+    # token hash is intentionally omitted — must never be visible in admin
     column_list = [
         RefreshToken.id,
         RefreshToken.user_id,
@@ -55,8 +69,8 @@ class RefreshTokenAdmin(ModelView, model=RefreshToken):
     column_filters = [RefreshToken.revoked, RefreshToken.expires_at]
     column_sortable_list = [RefreshToken.id, RefreshToken.expires_at]
 
-    # token must also be excluded from detail and form views
-    form_excluded_columns = [RefreshToken.token]
+    # token hash must also be excluded from detail and form views
+    form_excluded_columns = [RefreshToken.token_hash]
 
     can_create = False   # tokens are only created via auth flow
     can_export = False
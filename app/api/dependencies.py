@@ -1,31 +1,73 @@
+from typing import Any
+
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import principal_cache
+from app.core.dataloader import DataLoader
 from app.core.exceptions import UnauthorizedException
 from app.core.logging import user_id_ctx_var
 from app.core.security import decode_access_token
-from app.db.session import get_db
+from app.db.replicas import prefer_primary, wrote_recently
+from app.db.session import get_read_db
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
+# Columns copied into the principal cache — never the password hash.
+_PRINCIPAL_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "is_active",
+    "is_superuser",
+    "created_at",
+    "updated_at",
+)
+
+
+def _snapshot(user: User) -> dict[str, Any]:
+    return {field: getattr(user, field) for field in _PRINCIPAL_FIELDS}
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> User:
     try:
         user_id = int(decode_access_token(token))
     except (ValueError, TypeError):
         raise UnauthorizedException()
-    repo = UserRepository(db)
-    user = await repo.get_by_id(user_id)
-    if not user:
-        raise UnauthorizedException()
+    if wrote_recently(user_id):
+        # replicas may not have this user's latest write yet
+        prefer_primary()
+
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        # transient instance — not attached to any session, no DB round trip
+        user = User(**cached)
+    else:
+        repo = UserRepository(db)
+        user = await repo.get_by_id(user_id)
+        if not user:
+            raise UnauthorizedException()
+        principal_cache.set(user_id, _snapshot(user))
+
     if not user.is_active:
         raise UnauthorizedException("Inactive user")
     # inject user_id into logging context for the remainder of this request
     user_id_ctx_var.set(user.id)
     return user
+
+
+def get_user_loader(db: AsyncSession = Depends(get_read_db)) -> DataLoader[int, User]:
+    """Request-scoped loader: FastAPI builds it once per request, so lookups
+    anywhere in the request share one batch query and one memo."""
+    repo = UserRepository(db)
+
+    async def load(ids: list[int]) -> dict[int, User]:
+        return {user.id: user for user in await repo.get_many_by_ids(ids)}
+
+    return DataLoader(load)
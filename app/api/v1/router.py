@@ -1,7 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.api.v1.routers import auth, users
+from app.core.load_shedding import shed_load
+from app.core.responses import FastJSONResponse
 
-router = APIRouter()
+# shed_load runs first on every v1 route: 503 + Retry-After while overloaded
+router = APIRouter(
+    dependencies=[Depends(shed_load)],
+    default_response_class=FastJSONResponse,
+)
 router.include_router(auth.router, prefix="/auth", tags=["auth"])
 router.include_router(users.router, prefix="/users", tags=["users"])
@@ -1,15 +1,62 @@
-from fastapi import APIRouter, Depends, Query, status, Body
-from sqlalchemy.ext.asyncio import AsyncSession
+from collections.abc import AsyncIterator
 
-from app.api.dependencies import get_current_user
-from app.db.session import get_db
+from fastapi import APIRouter, Depends, Query, Request, Response, status, Body
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.dependencies import get_current_user, get_user_loader
+from app.core.config import settings
+from app.core.dataloader import DataLoader
+from app.core.exceptions import PayloadTooLargeException
+from app.core.limiter import read_limit, write_limit
+from app.core.responses import FastJSONResponse
+from app.db.session import get_db, get_read_db, get_session_factory
 from app.models.user import User
-from app.schemas.user import UserCreate, UserPage, UserRead, UserUpdate
+from app.repositories.count_strategy import CountMode
+from app.schemas.user import (
+    BulkImportReport,
+    UserCreate,
+    UserPage,
+    UserRead,
+    UserUpdate,
+)
+from app.services.user_export import MEDIA_TYPES, ExportFormat, export_users
 from app.services.user_service import UserService
 
 router = APIRouter()
 
 
+async def _body_lines(request: Request) -> AsyncIterator[bytes]:
+    """Split the request body into lines as it arrives.
+
+    Only each new chunk is split; the unterminated tail is carried over.
+    Lines over ``BULK_IMPORT_MAX_LINE_BYTES`` and bodies over
+    ``BULK_IMPORT_MAX_BODY_BYTES`` raise 413 as soon as the cap is crossed.
+    """
+    max_line = settings.BULK_IMPORT_MAX_LINE_BYTES
+    max_body = settings.BULK_IMPORT_MAX_BODY_BYTES
+    received = 0
+    tail = b""
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_body:
+            raise PayloadTooLargeException(f"Body exceeds {max_body} bytes")
+        *lines, rest = chunk.split(b"\n")
+        if lines:
+            lines[0] = tail + lines[0]
+            tail = rest
+        else:
+            tail += rest
+        for line in lines:
+            if len(line) > max_line:
+                raise PayloadTooLargeException(f"Line exceeds {max_line} bytes")
+            yield line
+        if len(tail) > max_line:
+            raise PayloadTooLargeException(f"Line exceeds {max_line} bytes")
+    if tail:
+        yield tail
+
+
 @router.post(
     "",
     response_model=UserRead,
@@ -18,9 +65,12 @@ router = APIRouter()
     responses={
         409: {"description": "Email already registered"},
         422: {"description": "Validation error (e.g. password too short)"},
+        429: {"description": "Rate limit exceeded"},
     },
 )
+@write_limit
 async def create_user(
+    request: Request,
     data: UserCreate = Body(...),
     db: AsyncSession = Depends(get_db),
 ) -> UserRead:
@@ -29,35 +79,142 @@ async def create_user(
     return await service.create_user(data)
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkImportReport,
+    summary="Bulk-create users from NDJSON",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "One `UserCreate` JSON object per line",
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+    responses={
+        401: {"description": "Missing or invalid token"},
+        413: {"description": "Too many rows, or a line or body too large"},
+        429: {"description": "Rate limit exceeded"},
+    },
+)
+@write_limit
+async def bulk_create_users(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _current_user: User = Depends(get_current_user),
+) -> Response:
+    """Create many users in one request. The body is read as it streams in;
+    each line gets a result (`created`, `conflict` or `invalid`), and bad
+    lines never abort the import. Requires authentication."""
+    service = UserService(db)
+    return FastJSONResponse(await service.import_users(_body_lines(request)))
+
+
 @router.get(
     "",
     response_model=UserPage,
-    summary="List users (paginated)",
-    responses={401: {"description": "Missing or invalid token"}},
+    summary="List users (paginated) or fetch a batch by id",
+    responses={
+        401: {"description": "Missing or invalid token"},
+        422: {"description": "Invalid pagination cursor or too many ids"},
+        429: {"description": "Rate limit exceeded"},
+    },
 )
+@read_limit
 async def list_users(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number, 1-indexed"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = Query(
+        None,
+        description=(
+            "Opaque `next_cursor` from a previous page. Switches to keyset "
+            "pagination (ignores `page`)."
+        ),
+    ),
+    count: CountMode | None = Query(
+        None,
+        description=(
+            "How `total` is computed: `exact` (count(*)), `estimated` "
+            "(planner statistics), or `cached` (exact, reused for a short "
+            "TTL). Defaults to `exact` in offset mode and to no total in "
+            "cursor mode."
+        ),
+    ),
+    ids: list[int] | None = Query(
+        None,
+        max_length=100,
+        description=(
+            "Fetch these users (`?ids=1&ids=2`, up to 100) in one query "
+            "instead of a page; unknown ids are skipped."
+        ),
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    loader: DataLoader[int, User] = Depends(get_user_loader),
     _current_user: User = Depends(get_current_user),
-) -> UserPage:
-    """Returns a paginated list of users. Requires authentication."""
+) -> Response:
+    """Returns a paginated list of users, or the users listed in `ids`.
+    Requires authentication."""
     service = UserService(db)
-    offset = (page - 1) * limit
-    return await service.list_users(limit=limit, offset=offset)
+    if ids:
+        result = await service.get_users(ids, loader)
+    elif cursor is not None:
+        result = await service.list_users_after(cursor, limit=limit, count=count)
+    else:
+        offset = (page - 1) * limit
+        result = await service.list_users(
+            limit=limit, offset=offset, count=count or "exact"
+        )
+    # already a UserPage: serialize once, skip response_model re-validation
+    return FastJSONResponse(result)
 
 
 @router.get(
     "/me",
     response_model=UserRead,
     summary="Get current authenticated user",
-    responses={401: {"description": "Missing or invalid token"}},
+    responses={
+        401: {"description": "Missing or invalid token"},
+        429: {"description": "Rate limit exceeded"},
+    },
 )
+@read_limit
 async def get_me(
+    request: Request,
     current_user: User = Depends(get_current_user),
-) -> UserRead:
+) -> Response:
     """Returns the profile of the currently authenticated user."""
-    return UserRead.model_validate(current_user)
+    return FastJSONResponse(UserRead.model_validate(current_user))
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export all users (streamed)",
+    responses={
+        200: {
+            "description": "One NDJSON line or CSV row per user, in id order",
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        },
+        401: {"description": "Missing or invalid token"},
+        429: {"description": "Rate limit exceeded"},
+    },
+)
+@read_limit
+async def export_all_users(
+    request: Request,
+    fmt: ExportFormat = Query(
+        "ndjson", alias="format", description="`ndjson` or `csv`"
+    ),
+    session_factory: async_sessionmaker = Depends(get_session_factory),
+    _current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream every user through a server-side cursor; memory stays flat
+    regardless of table size. Requires authentication."""
+    return StreamingResponse(
+        export_users(session_factory, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="users.{fmt}"'},
+    )
 
 
 @router.get(
@@ -67,16 +224,19 @@ async def get_me(
     responses={
         401: {"description": "Missing or invalid token"},
         404: {"description": "User not found"},
+        429: {"description": "Rate limit exceeded"},
     },
 )
+@read_limit
 async def get_user(
+    request: Request,
     user_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _current_user: User = Depends(get_current_user),
-) -> UserRead:
+) -> Response:
     """Fetch a single user by their numeric ID."""
     service = UserService(db)
-    return await service.get_user(user_id)
+    return FastJSONResponse(await service.get_user(user_id))
 
 
 @router.patch(
@@ -87,9 +247,12 @@ async def get_user(
         401: {"description": "Missing or invalid token"},
         404: {"description": "User not found"},
         409: {"description": "Email already taken"},
+        429: {"description": "Rate limit exceeded"},
     },
 )
+@write_limit
 async def update_user(
+    request: Request,
     user_id: int,
     data: UserUpdate,
     db: AsyncSession = Depends(get_db),
@@ -107,9 +270,12 @@ async def update_user(
     responses={
         401: {"description": "Missing or invalid token"},
         404: {"description": "User not found"},
+        429: {"description": "Rate limit exceeded"},
     },
 )
+@write_limit
 async def delete_user(
+    request: Request,
     user_id: int,
     db: AsyncSession = Depends(get_db),
     _current_user: User = Depends(get_current_user),
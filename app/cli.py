@@ -0,0 +1,40 @@
+"""Operational commands that share the app's settings and database setup.
+
+Usage::
+
+    python -m app.cli reap-refresh-tokens [--batch-size N] [--batch-delay S]
+"""
+
+import argparse
+import asyncio
+
+from app.core.logging import setup_logging
+from app.services.token_reaper import reap_refresh_tokens
+
+
+def _reap_refresh_tokens(args: argparse.Namespace) -> None:
+    deleted = asyncio.run(
+        reap_refresh_tokens(batch_size=args.batch_size, batch_delay=args.batch_delay)
+    )
+    print(f"Reaped {deleted} refresh tokens")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reap = commands.add_parser(
+        "reap-refresh-tokens",
+        help="Delete expired and revoked refresh tokens in batches",
+    )
+    reap.add_argument("--batch-size", type=int, default=None)
+    reap.add_argument("--batch-delay", type=float, default=None)
+    reap.set_defaults(func=_reap_refresh_tokens)
+
+    args = parser.parse_args(argv)
+    setup_logging()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
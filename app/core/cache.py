@@ -0,0 +1,64 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+from app.core.config import settings
+from app.core.metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Small in-process LRU cache whose entries also expire after ``ttl``.
+
+    Not shared between worker processes — invalidation only reaches the
+    current process, so keep ``ttl`` short enough to bound staleness
+    elsewhere. A ``ttl`` of 0 disables the cache entirely.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> V | None:
+        if self.ttl <= 0:
+            return None
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            CACHE_MISSES.labels(self.name).inc()
+            return None
+        self._data.move_to_end(key)
+        CACHE_HITS.labels(self.name).inc()
+        return entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        if self.ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            CACHE_EVICTIONS.labels(self.name).inc()
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Authenticated principals keyed by user id, used by get_current_user.
+# Values are plain column snapshots (never ORM instances bound to a session).
+principal_cache: TTLCache[dict[str, Any]] = TTLCache(
+    "principal",
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
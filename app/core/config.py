@@ -1,5 +1,6 @@
 from typing import Literal
 
+from limits import parse_many
 from pydantic import AnyUrl, Field, field_validator, model_validator
 from pydantic_settings import BaseSettings
 
@@ -15,8 +16,99 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     ENV: Literal["dev", "staging", "production"] = "dev"
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(7, ge=1)
+    # Live refresh tokens per user; logging in past the cap evicts the oldest.
+    MAX_ACTIVE_SESSIONS_PER_USER: int = Field(10, ge=1)
+    # Background cleanup of expired/revoked refresh tokens (see
+    # app.services.token_reaper). Each pass deletes in batches of BATCH_SIZE
+    # with BATCH_DELAY seconds between batches to cap the write rate.
+    REFRESH_TOKEN_REAPER_ENABLED: bool = True
+    REFRESH_TOKEN_REAPER_INTERVAL_SECONDS: float = Field(3600, gt=0)
+    REFRESH_TOKEN_REAPER_BATCH_SIZE: int = Field(1000, ge=1)
+    REFRESH_TOKEN_REAPER_BATCH_DELAY_SECONDS: float = Field(0.1, ge=0)
     DB_CONNECT_TIMEOUT: int = Field(5, ge=1)
 
+    # Connection pool (PostgreSQL only — SQLite uses NullPool).
+    DB_POOL_SIZE: int = Field(10, ge=1)  # persistent connections
+    DB_MAX_OVERFLOW: int = Field(20, ge=0)  # extra burst connections
+    DB_POOL_TIMEOUT: float = Field(30, gt=0)  # seconds to wait for a slot
+    DB_POOL_RECYCLE: int = Field(1800, ge=-1)  # max conn age (s); -1 = never
+    # True: test each connection on checkout (one extra round trip, never
+    # hands out a dead conn). False: optimistic — rely on recycle and
+    # invalidation after the first error.
+    DB_POOL_PRE_PING: bool = True
+    # LIFO reuses the most recent connection, letting idle ones age out
+    # (pairs well with server-side idle timeouts / PgBouncer).
+    DB_POOL_USE_LIFO: bool = False
+
+    # Optional streaming replicas for read-only requests (JSON list env var).
+    # Empty = every read goes to DATABASE_URL.
+    DATABASE_REPLICA_URLS: list[AnyUrl] = []
+    DB_REPLICA_STRATEGY: Literal["round_robin", "least_connections"] = "round_robin"
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(5, ge=0)
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = Field(5, gt=0)
+    # After a write, that user's reads stay on the primary this long.
+    DB_READ_YOUR_WRITES_SECONDS: float = Field(5, ge=0)
+
+    # bcrypt runs on a bounded worker pool so hashing never blocks the loop.
+    # Callers beyond MAX_PENDING queued jobs are rejected with 503.
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = Field(4, ge=1)
+    PASSWORD_HASH_MAX_PENDING: int = Field(64, ge=0)
+
+    # get_current_user principal cache (per process). TTL=0 disables it.
+    PRINCIPAL_CACHE_TTL_SECONDS: float = Field(30, ge=0)
+    PRINCIPAL_CACHE_MAX_SIZE: int = Field(10_000, ge=1)
+
+    # TTL for ?count=cached row counts on list endpoints.
+    COUNT_CACHE_TTL_SECONDS: float = Field(60, ge=0)
+    # Rows fetched per server-side cursor round trip (and per response
+    # chunk) by GET /users/export.
+    EXPORT_BATCH_SIZE: int = Field(1000, ge=1)
+    # POST /users/bulk: rows per conflict check + INSERT, and the most rows
+    # one request may carry (more is rejected with 413, nothing imported).
+    BULK_IMPORT_BATCH_SIZE: int = Field(500, ge=1)
+    BULK_IMPORT_MAX_ROWS: int = Field(10_000, ge=1)
+    # Byte caps checked while the body streams in (413 as soon as crossed),
+    # so an unterminated or oversized body never sits in memory whole.
+    BULK_IMPORT_MAX_LINE_BYTES: int = Field(8_192, ge=1)
+    BULK_IMPORT_MAX_BODY_BYTES: int = Field(10 * 1024 * 1024, ge=1)
+
+    # A statement (literals folded) run this many times in one request is
+    # logged as a likely N+1. With DEBUG on, responses also carry
+    # X-DB-Query-Count / X-DB-Query-Time-Ms / X-DB-Repeated-Queries.
+    DB_QUERY_REPEAT_THRESHOLD: int = Field(5, ge=2)
+    # Statements slower than this are logged with their (redacted)
+    # parameters; every statement also feeds db_query_duration_seconds.
+    DB_SLOW_QUERY_SECONDS: float = Field(0.5, gt=0)
+
+    # Histogram buckets (seconds) for http_request_duration_seconds.
+    # Env value is a JSON list, e.g. METRICS_LATENCY_BUCKETS=[0.01,0.1,1]
+    METRICS_LATENCY_BUCKETS: list[float] = [
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+    ]
+
+    # Rate-limit counters. memory:// is per process (each worker enforces its
+    # own budget); point this at redis://host:6379 so limits hold across
+    # workers and pods.
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    # Hits each process reserves from the shared counter per round trip
+    # (capped at a tenth of the limit, see app.core.rate_limit_storage).
+    RATE_LIMIT_LEASE_SIZE: int = Field(20, ge=1)
+    # Budgets (limits notation, e.g. "10/minute;100/hour"). Login/refresh
+    # are per IP; reads and writes on /users are per route and per user
+    # (per IP when anonymous).
+    RATE_LIMIT_LOGIN: str = "10/minute"
+    RATE_LIMIT_REFRESH: str = "20/minute"
+    RATE_LIMIT_READ: str = "300/minute"
+    RATE_LIMIT_WRITE: str = "60/minute"
+
+    # Load shedding: /api requests get 503 + Retry-After while the smoothed
+    # DB pool checkout wait or the event-loop lag is above these thresholds.
+    LOAD_SHED_ENABLED: bool = True
+    LOAD_SHED_POOL_WAIT_SECONDS: float = Field(0.5, gt=0)
+    LOAD_SHED_LOOP_LAG_SECONDS: float = Field(0.25, gt=0)
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = Field(2, ge=1)
+
     # Admin panel token — set a strong secret in production.
     # Defaults to SECRET_KEY so local dev works with zero extra config.
     ADMIN_TOKEN: str = ""
@@ -34,6 +126,25 @@ class Settings(BaseSettings):
             return v.replace("postgresql://", "postgresql+asyncpg://", 1)
         return v
 
+    @field_validator("DATABASE_REPLICA_URLS", mode="before")
+    def _ensure_replica_asyncpg_prefix(cls, v: list) -> list:
+        if isinstance(v, list):
+            return [cls._ensure_asyncpg_prefix(url) for url in v]
+        return v
+
+    @field_validator("METRICS_LATENCY_BUCKETS")
+    def _sorted_buckets(cls, v: list[float]) -> list[float]:
+        if not v:
+            raise ValueError("METRICS_LATENCY_BUCKETS must not be empty")
+        return sorted(v)
+
+    @field_validator(
+        "RATE_LIMIT_LOGIN", "RATE_LIMIT_REFRESH", "RATE_LIMIT_READ", "RATE_LIMIT_WRITE"
+    )
+    def _valid_rate_limit(cls, v: str) -> str:
+        parse_many(v)  # fail at startup on malformed strings, not per request
+        return v
+
     @model_validator(mode="before")
     def _disable_debug_in_production(cls, values: dict) -> dict:
         # always force DEBUG=False in production regardless of env input
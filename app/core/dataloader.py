@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Coalesces ``load`` calls made in the same event-loop tick.
+
+    Keys requested before the loop gets back to its scheduled callbacks
+    are fetched together with one ``batch_fn(keys)`` call, which returns
+    ``{key: value}`` (missing keys load as ``None``). Results are memoized
+    for the loader's lifetime — create one per request. Batches run one at
+    a time, so ``batch_fn`` may use a single ``AsyncSession``.
+    """
+
+    def __init__(
+        self, batch_fn: Callable[[list[K]], Awaitable[Mapping[K, V]]]
+    ) -> None:
+        self.batch_fn = batch_fn
+        self._futures: dict[K, asyncio.Future[V | None]] = {}
+        self._queue: list[K] = []
+        self._lock = asyncio.Lock()
+        # the loop only keeps weak references to tasks; hold running batches
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def load(self, key: K) -> asyncio.Future[V | None]:
+        future = self._futures.get(key)
+        if future is None or future.cancelled():
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[V | None]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self) -> None:
+        # Snapshot the futures this batch answers: a key cancelled and
+        # loaded again gets a new future that belongs to a later batch.
+        batch = {key: self._futures[key] for key in self._queue}
+        self._queue = []
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _forget(self, key: K, future: asyncio.Future[V | None]) -> None:
+        if self._futures.get(key) is future:
+            del self._futures[key]
+
+    async def _run_batch(self, batch: dict[K, asyncio.Future[V | None]]) -> None:
+        try:
+            async with self._lock:
+                values = await self.batch_fn(list(batch))
+        except Exception as exc:
+            for key, future in batch.items():
+                # forget failures so a later load can retry
+                self._forget(key, future)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
+            elif future.cancelled() or future.exception() is not None:
+                # its waiter gave up: don't memoize it, refetch on next load
+                self._forget(key, future)
@@ -27,3 +27,21 @@ class UnauthorizedException(AppException):
 class ForbiddenException(AppException):
     def __init__(self, detail: str = "Access forbidden") -> None:
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+class PayloadTooLargeException(AppException):
+    def __init__(self, detail: str = "Request payload too large") -> None:
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail
+        )
+
+
+class ServiceUnavailableException(AppException):
+    def __init__(
+        self, detail: str = "Service temporarily overloaded", retry_after: int = 1
+    ) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Literal, ParamSpec, TypeVar
+
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import (
+    WORKER_POOL_IN_FLIGHT,
+    WORKER_POOL_QUEUE_DEPTH,
+    WORKER_POOL_WAIT_SECONDS,
+)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class BoundedExecutor:
+    """Runs blocking or CPU-heavy callables off the event loop.
+
+    At most ``max_workers`` jobs run at once. Up to ``max_pending`` further
+    callers wait for a slot; anything beyond that is rejected with 503
+    instead of piling up an unbounded queue behind a saturated pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_pending: int,
+        kind: Literal["thread", "process"] = "thread",
+    ) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        # asyncio.Semaphore binds to the loop it first waits on, so keep one
+        # per running loop (tests spin up a fresh loop per test).
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            self.max_workers, thread_name_prefix=self.name
+                        )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_workers)
+            self._semaphores[loop] = sem
+        return sem
+
+    async def run(self, fn: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+        sem = self._get_semaphore()
+        if sem.locked():
+            if self._pending >= self.max_pending:
+                raise ServiceUnavailableException()
+            self._pending += 1
+            WORKER_POOL_QUEUE_DEPTH.labels(self.name).inc()
+            start = time.perf_counter()
+            try:
+                await sem.acquire()
+            finally:
+                self._pending -= 1
+                WORKER_POOL_QUEUE_DEPTH.labels(self.name).dec()
+            WORKER_POOL_WAIT_SECONDS.labels(self.name).observe(
+                time.perf_counter() - start
+            )
+        else:
+            await sem.acquire()
+            WORKER_POOL_WAIT_SECONDS.labels(self.name).observe(0)
+
+        WORKER_POOL_IN_FLIGHT.labels(self.name).inc()
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(fn, *args, **kwargs)
+            return await loop.run_in_executor(self._get_executor(), call)
+        finally:
+            WORKER_POOL_IN_FLIGHT.labels(self.name).dec()
+            sem.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
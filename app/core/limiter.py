@@ -1,6 +1,39 @@
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+# registers the "leased://" storage scheme with limits
+import app.core.rate_limit_storage  # noqa: F401
+from app.core.config import settings
+from app.core.logging import user_id_ctx_var
+
 # Singleton rate limiter — imported by main.py (to register on app)
-# and by routers (to use the @limiter.limit decorator)
-limiter = Limiter(key_func=get_remote_address)
+# and by routers (to use the @limiter.limit decorator).
+# Counters live in RATE_LIMIT_STORAGE_URI (shared across workers when it
+# points at Redis); each process leases blocks of hits from it so most
+# requests are admitted without a round trip.
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri="leased://",
+    storage_options={
+        "shared_uri": settings.RATE_LIMIT_STORAGE_URI,
+        "lease_size": settings.RATE_LIMIT_LEASE_SIZE,
+    },
+)
+
+
+def user_or_ip(request: Request) -> str:
+    """Rate-limit key: the authenticated user, else the client IP.
+
+    slowapi evaluates it after FastAPI has resolved the route's
+    dependencies, so ``get_current_user`` has already set the user id.
+    """
+    user_id = user_id_ctx_var.get()
+    if user_id is not None:
+        return f"user:{user_id}"
+    return f"ip:{get_remote_address(request)}"
+
+
+# Limit strings are read per request so they follow the current settings.
+read_limit = limiter.limit(lambda: settings.RATE_LIMIT_READ, key_func=user_or_ip)
+write_limit = limiter.limit(lambda: settings.RATE_LIMIT_WRITE, key_func=user_or_ip)
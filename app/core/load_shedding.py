@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+from app.core.metrics import EVENT_LOOP_LAG_SECONDS, LOAD_SHED_REQUESTS
+
+
+class LoadMonitor:
+    """Per-process overload signals used to shed load early.
+
+    ``pool_wait`` is an exponentially weighted average of DB pool checkout
+    waits that also halves every ``half_life`` seconds without samples, so
+    shedding stops once checkouts stop queueing (including when shedding
+    itself has drained the pool). ``loop_lag`` is how late the last
+    ``watch_loop`` probe woke up.
+    """
+
+    def __init__(self, half_life: float = 1.0, weight: float = 0.2) -> None:
+        self.half_life = half_life
+        self.weight = weight
+        self.loop_lag = 0.0
+        self._pool_wait = 0.0
+        self._pool_wait_at = time.monotonic()
+
+    @property
+    def pool_wait(self) -> float:
+        elapsed = time.monotonic() - self._pool_wait_at
+        return self._pool_wait * 0.5 ** (elapsed / self.half_life)
+
+    def record_pool_wait(self, seconds: float) -> None:
+        current = self.pool_wait
+        self._pool_wait = current + self.weight * (seconds - current)
+        self._pool_wait_at = time.monotonic()
+
+    def overload_reason(self) -> str | None:
+        if self.pool_wait > settings.LOAD_SHED_POOL_WAIT_SECONDS:
+            return "db_pool_wait"
+        if self.loop_lag > settings.LOAD_SHED_LOOP_LAG_SECONDS:
+            return "event_loop_lag"
+        return None
+
+    async def watch_loop(self, interval: float = 0.1) -> None:
+        """Measure event-loop lag forever; run as a background task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.loop_lag = max(0.0, loop.time() - start - interval)
+            EVENT_LOOP_LAG_SECONDS.set(self.loop_lag)
+
+
+# Fed by InstrumentedAsyncQueuePool and the lifespan lag probe.
+load_monitor = LoadMonitor()
+
+
+async def shed_load() -> None:
+    """Router dependency: reject the request with 503 while overloaded.
+
+    Runs before the route's own dependencies, so a shed request never
+    touches the pool or bcrypt workers.
+    """
+    if not settings.LOAD_SHED_ENABLED:
+        return
+    reason = load_monitor.overload_reason()
+    if reason is not None:
+        LOAD_SHED_REQUESTS.labels(reason).inc()
+        raise ServiceUnavailableException(
+            "Server overloaded, retry later",
+            retry_after=settings.LOAD_SHED_RETRY_AFTER_SECONDS,
+        )
@@ -0,0 +1,176 @@
+import os
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.config import settings
+
+# Prometheus collectors shared across modules. Kept in one place so every
+# metric name is registered exactly once, whichever module imports it first.
+
+# Multi-worker mode: when PROMETHEUS_MULTIPROC_DIR is set, every worker
+# writes its samples to mmap files in that directory and /metrics merges
+# them at scrape time. prometheus_client reads the variable when it is
+# first imported, so it must be a real environment variable (not .env),
+# and the directory must be emptied before the workers start.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+WORKER_POOL_QUEUE_DEPTH = Gauge(
+    "worker_pool_queue_depth",
+    "Jobs waiting for a free slot in a bounded worker pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+WORKER_POOL_IN_FLIGHT = Gauge(
+    "worker_pool_in_flight",
+    "Jobs currently running in a bounded worker pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+WORKER_POOL_WAIT_SECONDS = Histogram(
+    "worker_pool_wait_seconds",
+    "Time a job spent waiting for a worker pool slot",
+    ["pool"],
+)
+
+CACHE_HITS = Counter("cache_hits_total", "In-process cache hits", ["cache"])
+CACHE_MISSES = Counter("cache_misses_total", "In-process cache misses", ["cache"])
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total", "Entries dropped to respect the size limit", ["cache"]
+)
+
+# HTTP metrics are labelled by route template ("/api/v1/users/{user_id}"),
+# never the raw URL, so series count is bounded by the number of routes.
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "path", "status_code"],
+    buckets=settings.METRICS_LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+_SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+REQUEST_SIZE = Histogram(
+    "http_request_size_bytes",
+    "HTTP request body size",
+    ["method", "path"],
+    buckets=_SIZE_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size",
+    ["method", "path"],
+    buckets=_SIZE_BUCKETS,
+)
+SCRAPE_DURATION = Histogram(
+    "metrics_scrape_duration_seconds",
+    "Time spent rendering the /metrics payload",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+# Database connection pool, labelled by engine ("primary", replicas...).
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool warms up)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to obtain a connection from the pool, including new connects",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+# One series per statement fingerprint (literals and IN lists folded), so
+# cardinality is bounded by the statements the code can issue.
+DB_QUERY_DURATION_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Time spent in cursor.execute per SQL statement",
+    ["statement"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT (pool exhausted)",
+    ["pool"],
+)
+DB_POOL_CONNECTS = Counter(
+    "db_pool_connects_total", "New DBAPI connections opened", ["pool"]
+)
+DB_POOL_CLOSES = Counter(
+    "db_pool_closes_total", "DBAPI connections closed by the pool", ["pool"]
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total",
+    "Connections invalidated (errors, failed pre-ping, soft invalidation)",
+    ["pool"],
+)
+
+DB_REPLICA_LAG_SECONDS = Gauge(
+    "db_replica_lag_seconds",
+    "Replication lag reported by the last health probe",
+    ["replica"],
+    multiprocess_mode="livemax",
+)
+DB_REPLICA_HEALTHY = Gauge(
+    "db_replica_healthy",
+    "1 if the replica is receiving reads, 0 if it is being skipped",
+    ["replica"],
+    multiprocess_mode="livemin",
+)
+
+REFRESH_TOKENS_REAPED = Counter(
+    "refresh_tokens_reaped_total", "Expired or revoked refresh tokens deleted"
+)
+REFRESH_TOKEN_REAP_SECONDS = Histogram(
+    "refresh_token_reap_duration_seconds",
+    "Wall time of one refresh-token reaper pass",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+
+EVENT_LOOP_LAG_SECONDS = Gauge(
+    "event_loop_lag_seconds",
+    "How late the last event-loop lag probe woke up",
+    multiprocess_mode="livemax",
+)
+LOAD_SHED_REQUESTS = Counter(
+    "load_shed_requests_total",
+    "Requests rejected with 503 because the process was overloaded",
+    ["reason"],
+)
+
+
+def render_latest() -> bytes:
+    """Exposition payload for /metrics, aggregated across workers if needed."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
+
+
+def mark_worker_dead(pid: int | None = None) -> None:
+    """Drop a stopped worker's live gauges so they stop counting.
+
+    Counters and histograms persist on purpose — their totals must not go
+    backwards when a worker is recycled.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid if pid is not None else os.getpid())
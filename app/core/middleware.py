@@ -0,0 +1,117 @@
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import request_id_ctx_var, user_id_ctx_var
+from app.core.metrics import (
+    REQUEST_LATENCY,
+    REQUEST_SIZE,
+    REQUESTS_IN_PROGRESS,
+    RESPONSE_SIZE,
+)
+from app.db.query_stats import QueryStats, finish_request, start_request
+
+_SECURITY_HEADERS = {
+    "Strict-Transport-Security": "max-age=63072000; includeSubDomains; preload",
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "Referrer-Policy": "same-origin",
+}
+
+_UNMATCHED = "<unmatched>"
+
+
+def _query_headers(headers: MutableHeaders, stats: QueryStats) -> None:
+    # statements run before the response started; a streamed body's
+    # queries are not included
+    headers["X-DB-Query-Count"] = str(stats.count)
+    headers["X-DB-Query-Time-Ms"] = f"{stats.duration * 1000:.2f}"
+    headers["X-DB-Repeated-Queries"] = str(
+        len(stats.repeated(settings.DB_QUERY_REPEAT_THRESHOLD))
+    )
+
+
+def route_label(scope: Scope) -> str:
+    """Low-cardinality path label for a request that has been routed.
+
+    FastAPI stores the matched ``APIRoute`` in the scope, whose ``path`` is
+    the template (``/api/v1/users/{user_id}``). Mounted sub-apps such as
+    the admin panel collapse to their mount prefix; 404s to one label.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "app_root_path" in scope:
+        mount = scope["root_path"][len(scope["app_root_path"]) :]
+        return f"{mount}/{{path}}"
+    return _UNMATCHED
+
+
+class ObservabilityMiddleware:
+    """Request ID, HTTP metrics, query stats and security headers in one raw
+    ASGI layer.
+
+    Replaces three stacked ``BaseHTTPMiddleware`` classes: no extra task or
+    anyio stream per request, and streaming responses pass straight through
+    because only the ``http.response.start`` message is touched.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = str(uuid.uuid4())
+        token = request_id_ctx_var.set(rid)
+        # set later by get_current_user; never inherit a previous request's
+        user_token = user_id_ctx_var.set(None)
+        query_stats, stats_token = start_request()
+        method = scope["method"]
+        status_code = 500
+        request_size = 0
+        response_size = 0
+        start = time.perf_counter()
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = rid
+                for name, value in _SECURITY_HEADERS.items():
+                    headers[name] = value
+                if settings.DEBUG:
+                    _query_headers(headers, query_stats)
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            in_progress.dec()
+            # routing has run by now, so the scope carries the matched route
+            path = route_label(scope)
+            REQUEST_LATENCY.labels(method, path, status_code).observe(
+                time.perf_counter() - start
+            )
+            REQUEST_SIZE.labels(method, path).observe(request_size)
+            RESPONSE_SIZE.labels(method, path).observe(response_size)
+            finish_request(stats_token, path)
+            request_id_ctx_var.reset(token)
+            user_id_ctx_var.reset(user_token)
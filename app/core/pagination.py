@@ -0,0 +1,20 @@
+import base64
+import binascii
+
+
+def encode_cursor(last_id: int) -> str:
+    """Opaque keyset cursor pointing just past ``last_id``."""
+    raw = f"id:{last_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Inverse of ``encode_cursor``. Raises ValueError on tampered input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, _, value = base64.urlsafe_b64decode(padded).decode().partition(":")
+        if prefix != "id":
+            raise ValueError
+        return int(value)
+    except (ValueError, binascii.Error, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid pagination cursor") from exc
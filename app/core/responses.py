@@ -0,0 +1,25 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by pydantic-core's Rust serializer.
+
+    Pydantic models are dumped straight to bytes with their compiled
+    serializer — no intermediate dicts, no ``jsonable_encoder``, no stdlib
+    ``json``. Anything else (FastAPI's already-encoded response_model
+    output, error payloads) goes through ``pydantic_core.to_json``, which
+    is a drop-in, faster ``json.dumps``.
+
+    Routes that return a model wrapped in this class directly also skip
+    FastAPI's response_model re-validation; reserve that for models that
+    already are the declared ``response_model``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return to_json(content)
@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -5,6 +7,16 @@ import bcrypt
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.executor import BoundedExecutor
+
+# bcrypt releases the GIL, so a thread pool gives real parallelism; a process
+# pool is available for deployments that prefer full isolation.
+password_hasher = BoundedExecutor(
+    "password_hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
 
 
 def hash_password(password: str) -> str:
@@ -12,12 +24,60 @@ def hash_password(password: str) -> str:
     return hashed.decode("utf-8")
 
 
+def hash_passwords(passwords: list[str]) -> list[str]:
+    return [hash_password(password) for password in passwords]
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         plain_password.encode("utf-8"), hashed_password.encode("utf-8")
     )
 
 
+async def hash_password_async(password: str) -> str:
+    """Same as ``hash_password`` but runs on the password worker pool."""
+    return await password_hasher.run(hash_password, password)
+
+
+async def hash_passwords_async(
+    passwords: list[str], chunk_size: int = 8
+) -> list[str]:
+    """Hash many passwords on the worker pool, in order.
+
+    Work is split into ``chunk_size`` jobs run by at most half the pool's
+    workers at once; each lane releases its slot between jobs, so logins
+    and sign-ups queue behind one chunk rather than the whole batch.
+    """
+    chunks = [
+        passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)
+    ]
+    hashed: list[list[str]] = [[] for _ in chunks]
+    jobs = iter(range(len(chunks)))
+
+    async def lane() -> None:
+        for i in jobs:
+            hashed[i] = await password_hasher.run(hash_passwords, chunks[i])
+
+    lanes = min(len(chunks), max(1, password_hasher.max_workers // 2))
+    await asyncio.gather(*(lane() for _ in range(lanes)))
+    return [h for chunk in hashed for h in chunk]
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Same as ``verify_password`` but runs on the password worker pool."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Lookup key for a refresh token.
+
+    Refresh tokens are 256-bit random values, so a fast unsalted SHA-256 is
+    enough: it cannot be brute-forced, and it stays deterministic so the
+    token can be found with a single indexed equality lookup.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
 def create_access_token(subject: Any, expires_delta: timedelta | None = None) -> str:
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -0,0 +1,182 @@
+import contextvars
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import DB_QUERY_DURATION_SECONDS
+
+_WHITESPACE = re.compile(r"\s+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|(?<!:):\w+|\b\d+(?:\.\d+)?\b")
+# asyncpg binds are typed ("$1::VARCHAR", "$2::TIMESTAMP WITH TIME ZONE");
+# drop the cast so typed lists fold like bare ones.
+_CAST = re.compile(
+    r"\?::[A-Za-z_]\w*"
+    r"(?:\s+(?:PRECISION|VARYING|WITH(?:OUT)?\s+TIME\s+ZONE))?"
+    r"(?:\(\?(?:\s*,\s*\?)?\))?(?:\[\])*"
+)
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUES_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+# Bind names whose values never reach the logs (hashed_password,
+# token_hash, ...).
+_SENSITIVE = re.compile(r"password|token|secret", re.IGNORECASE)
+_REDACTED = "<redacted>"
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Statement text with literals, bind markers (and their casts),
+    IN-list lengths and multi-row VALUES folded to ``?`` so repeats of one
+    query compare equal."""
+    text = _LITERAL.sub("?", _WHITESPACE.sub(" ", statement).strip())
+    text = _CAST.sub("?", text)
+    return _VALUES_LIST.sub("(?)", _PLACEHOLDER_LIST.sub("?", text))
+
+
+def redact_parameters(context: Any, parameters: Any) -> Any:
+    """Bound parameters by name, with password/token values masked.
+
+    Positional parameters are matched to names through the compiled
+    statement; when that is not possible (textual SQL, rewritten bulk
+    inserts) every value is masked. For executemany only the first row is
+    kept.
+    """
+    names = getattr(getattr(context, "compiled", None), "positiontup", None)
+    if context is not None and context.executemany and parameters:
+        parameters = parameters[0]
+    if isinstance(parameters, Mapping):
+        items = list(parameters.items())
+    elif isinstance(parameters, Sequence) and len(names or ()) == len(parameters):
+        items = list(zip(names, parameters))
+    else:
+        return _REDACTED
+    return {
+        name: _REDACTED if _SENSITIVE.search(name) else value
+        for name, value in items
+    }
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0  # seconds spent in cursor.execute
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Fingerprints run at least ``threshold`` times (likely N+1)."""
+        return {fp: n for fp, n in self.fingerprints.items() if n >= threshold}
+
+
+# Stats for the request running in the current context (set by the
+# middleware), plus extra sinks opened with capture_queries().
+_request_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+_captures: contextvars.ContextVar[tuple[QueryStats, ...]] = contextvars.ContextVar(
+    "query_captures", default=()
+)
+
+
+def start_request() -> tuple[QueryStats, contextvars.Token[QueryStats | None]]:
+    """Track this context's statements; pass the token to finish_request."""
+    stats = QueryStats()
+    return stats, _request_stats.set(stats)
+
+
+def finish_request(
+    token: contextvars.Token[QueryStats | None], path: str
+) -> QueryStats | None:
+    """Stop tracking the request and log its likely N+1 statements."""
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    if stats is not None:
+        repeated = stats.repeated(settings.DB_QUERY_REPEAT_THRESHOLD)
+        for statement, n in repeated.items():
+            logger.warning(
+                "Statement repeated %d times in one request (possible N+1)",
+                n,
+                extra={"path": path, "statement": statement},
+            )
+    return stats
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """Record every statement run in this context (tests, scripts)."""
+    stats = QueryStats()
+    token = _captures.set((*_captures.get(), stats))
+    try:
+        yield stats
+    finally:
+        _captures.reset(token)
+
+
+def _sinks() -> tuple[QueryStats, ...]:
+    request_stats = _request_stats.get()
+    if request_stats is None:
+        return _captures.get()
+    return (*_captures.get(), request_stats)
+
+
+def _before_cursor_execute(conn: Any, *args: Any) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    DB_QUERY_DURATION_SECONDS.labels(fingerprint(statement)).observe(elapsed)
+    if elapsed >= settings.DB_SLOW_QUERY_SECONDS:
+        logger.warning(
+            "Slow query: %.3fs",
+            elapsed,
+            extra={
+                "statement": fingerprint(statement),
+                "duration_ms": round(elapsed * 1000, 2),
+                "parameters": redact_parameters(context, parameters),
+                "rows": len(parameters) if executemany else 1,
+            },
+        )
+    for stats in _sinks():
+        stats.record(statement, elapsed)
+
+
+def _handle_error(context: Any) -> None:
+    # a failed execute never reaches after_cursor_execute
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement run on ``engine`` (histogram + slow-query log)
+    and feed it into per-request ``QueryStats``.
+
+    Engine events run inside SQLAlchemy's greenlet, which shares the
+    calling task's context, so the request's stats are visible here.
+    """
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+import itertools
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import DB_REPLICA_HEALTHY, DB_REPLICA_LAG_SECONDS
+
+# Seconds the replica is behind the primary. Zero when it has replayed
+# everything it received (an idle primary would otherwise look "lagging"),
+# and zero on a server that is not in recovery at all.
+_LAG_SQL = text(
+    "SELECT COALESCE(CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+    "END, 0)"
+)
+
+# Set for the rest of the request once it must read from the primary.
+_prefer_primary: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "prefer_primary", default=False
+)
+
+# Users who wrote recently; their reads stay on the primary until the
+# replicas have (very likely) caught up. Per process, like the principal
+# cache — another worker may still route that user to a replica.
+_recent_writers: TTLCache[bool] = TTLCache(
+    "read_your_writes",
+    maxsize=100_000,
+    ttl=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = True
+    lag: float = 0.0
+
+    def checked_out(self) -> int:
+        return self.engine.sync_engine.pool.checkedout()
+
+
+class ReplicaSet:
+    """Picks a healthy read replica per statement.
+
+    Replicas that fail the lag probe or lag by more than ``max_lag`` seconds
+    are skipped until a later probe passes; with none healthy (or none
+    configured) ``choose`` returns ``None`` and reads use the primary.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        strategy: Literal["round_robin", "least_connections"],
+        max_lag: float,
+    ) -> None:
+        self.replicas = replicas
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self._counter = itertools.count()
+
+    def choose(self) -> Replica | None:
+        healthy = [r for r in self.replicas if r.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_connections":
+            return min(healthy, key=Replica.checked_out)
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def check(self) -> None:
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    lag = float((await conn.execute(_LAG_SQL)).scalar_one())
+                replica.lag = lag
+                healthy = lag <= self.max_lag
+            except Exception:
+                logger.warning("Replica %s health check failed", replica.name)
+                healthy = False
+            if healthy != replica.healthy:
+                logger.warning(
+                    "Replica %s is now %s (lag %.1fs)",
+                    replica.name,
+                    "healthy" if healthy else "unhealthy",
+                    replica.lag,
+                )
+            replica.healthy = healthy
+            DB_REPLICA_LAG_SECONDS.labels(replica.name).set(replica.lag)
+            DB_REPLICA_HEALTHY.labels(replica.name).set(int(healthy))
+
+    async def monitor(self, interval: float) -> None:
+        """Re-probe every replica forever; run as a background task."""
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+
+def prefer_primary() -> None:
+    """Route every remaining read in the current request to the primary."""
+    _prefer_primary.set(True)
+
+
+def primary_preferred() -> bool:
+    return _prefer_primary.get()
+
+
+def mark_recent_write(*user_ids: int | None) -> None:
+    """Keep these users' reads on the primary for a short while."""
+    for user_id in user_ids:
+        if user_id is not None:
+            _recent_writers.set(user_id, True)
+
+
+def wrote_recently(user_id: int) -> bool:
+    return _recent_writers.get(user_id) is not None
@@ -1,13 +1,19 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, instrument_pool
+from app.db.query_stats import instrument_engine
+from app.db.replicas import Replica, ReplicaSet, primary_preferred
 
 _db_url = str(settings.DATABASE_URL)
 
@@ -22,15 +28,20 @@ _engine_kwargs: dict = {
 if _is_sqlite:
     _engine_kwargs["poolclass"] = NullPool
 else:
-    # pool_size: persistent connections kept alive.
-    # max_overflow: extra burst connections.
-    # pool_pre_ping: validates connections before use (detects stale conns).
-    _engine_kwargs["pool_size"] = 10
-    _engine_kwargs["max_overflow"] = 20
-    _engine_kwargs["pool_pre_ping"] = True
+    # All knobs come from Settings (DB_POOL_*) so each deployment can size
+    # its pool from the db_pool_* metrics.
+    _engine_kwargs["poolclass"] = InstrumentedAsyncQueuePool
+    _engine_kwargs["pool_size"] = settings.DB_POOL_SIZE
+    _engine_kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+    _engine_kwargs["pool_timeout"] = settings.DB_POOL_TIMEOUT
+    _engine_kwargs["pool_recycle"] = settings.DB_POOL_RECYCLE
+    _engine_kwargs["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    _engine_kwargs["pool_use_lifo"] = settings.DB_POOL_USE_LIFO
     _engine_kwargs["connect_args"] = {"timeout": settings.DB_CONNECT_TIMEOUT}
 
 engine = create_async_engine(_db_url, **_engine_kwargs)
+instrument_pool(engine.sync_engine.pool, "primary")
+instrument_engine(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -40,8 +51,91 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Read replicas share the primary's pool settings; each gets its own pool.
+# They only ever serve ReadOnlySession, so they are AUTOCOMMIT too.
+replicas = ReplicaSet(
+    [
+        Replica(
+            name=f"replica{i}",
+            engine=create_async_engine(str(url), **_engine_kwargs).execution_options(
+                isolation_level="AUTOCOMMIT"
+            ),
+        )
+        for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+    ],
+    strategy=settings.DB_REPLICA_STRATEGY,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+)
+for _replica in replicas.replicas:
+    instrument_pool(_replica.engine.sync_engine.pool, _replica.name)
+    instrument_engine(_replica.engine)
+
+
+class _ReadOnlySyncSession(Session):
+    def get_bind(self, mapper: Any = None, **kw: Any) -> Any:
+        # Route each statement to a healthy replica unless this request has
+        # to read its own writes; fall back to the session's own bind.
+        if kw.get("bind") is None and not primary_preferred():
+            replica = replicas.choose()
+            if replica is not None:
+                return replica.engine.sync_engine
+        return super().get_bind(mapper, **kw)
+
+    def flush(self, objects: Any = None) -> None:
+        if self.new or self.dirty or self.deleted:
+            raise InvalidRequestError("Read-only session cannot flush changes")
+        super().flush(objects)
+
+
+class ReadOnlySession(AsyncSession):
+    """Session for read-only requests.
+
+    Bound to an AUTOCOMMIT view of the engine, so statements run without
+    BEGIN/COMMIT, and the connection goes back to the pool as soon as each
+    statement's (buffered) result is fetched rather than being held until
+    the response is serialized. Statements go to a read replica when any
+    are configured and healthy. Flushing pending changes raises.
+    """
+
+    sync_session_class = _ReadOnlySyncSession
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await super().execute(*args, **kwargs)
+        finally:
+            # autocommit: nothing is sent to the server, this only releases
+            # the connection until the next statement needs one
+            await self.commit()
+
+
+# Shares the primary pool; AUTOCOMMIT is a client-side flag on asyncpg.
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-write session: one transaction for the whole request."""
     async with AsyncSessionLocal() as session:
         async with session.begin():
             yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session: no transaction, connection held per statement."""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for work that outlives the request's dependencies.
+
+    Streaming response bodies are sent after ``get_db``/``get_read_db``
+    have already closed their sessions, so they open their own from this.
+    """
+    return AsyncSessionLocal
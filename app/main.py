@@ -1,16 +1,14 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from collections.abc import AsyncGenerator
-import time
-import uuid
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from sqladmin import Admin
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from prometheus_client import Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import CONTENT_TYPE_LATEST
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.middleware import SlowAPIMiddleware
 
@@ -20,62 +18,42 @@ from app.api.v1.router import router as v1_router
 from app.core.config import settings
 from app.core.exceptions import AppException
 from app.core.limiter import limiter
-from app.core.logging import logger, setup_logging, request_id_ctx_var
-from app.db.session import engine
-
-
-# Prometheus histogram for request latency
-REQUEST_LATENCY = Histogram(
-    "http_request_duration_seconds",
-    "HTTP request latency",
-    ["method", "path", "status_code"],
-)
-
-
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    """Assigns a unique request ID to each incoming request."""
-
-    async def dispatch(self, request: Request, call_next):
-        rid = str(uuid.uuid4())
-        request_id_ctx_var.set(rid)
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = rid
-        return response
-
-
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Records request latency for Prometheus."""
-
-    async def dispatch(self, request: Request, call_next):
-        start = time.time()
-        response = await call_next(request)
-        elapsed = time.time() - start
-        REQUEST_LATENCY.labels(
-            request.method, request.url.path, response.status_code
-        ).observe(elapsed)
-        return response
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Injects common security headers into every response."""
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=63072000; includeSubDomains; preload"
-        )
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["Referrer-Policy"] = "same-origin"
-        return response
+from app.core.load_shedding import load_monitor
+from app.core.logging import logger, setup_logging
+from app.core.metrics import SCRAPE_DURATION, mark_worker_dead, render_latest
+from app.core.middleware import ObservabilityMiddleware
+from app.core.security import password_hasher
+from app.db.session import engine, replicas
+from app.services.token_reaper import run_token_reaper
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     setup_logging()
     logger.info("Application starting up")
+    background: list[asyncio.Task] = []
+    if replicas.replicas:
+        background.append(
+            asyncio.create_task(
+                replicas.monitor(settings.DB_REPLICA_CHECK_INTERVAL_SECONDS)
+            )
+        )
+    if settings.LOAD_SHED_ENABLED:
+        background.append(asyncio.create_task(load_monitor.watch_loop()))
+    if settings.REFRESH_TOKEN_REAPER_ENABLED:
+        background.append(
+            asyncio.create_task(
+                run_token_reaper(settings.REFRESH_TOKEN_REAPER_INTERVAL_SECONDS)
+            )
+        )
     yield
     logger.info("Application shutting down")
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    password_hasher.shutdown()
+    mark_worker_dead()
 
 
 _TAGS_METADATA = [
@@ -192,9 +170,9 @@ async def health() -> dict:
 
 
 # Register middlewares (order matters: outermost first)
-app.add_middleware(RequestIdMiddleware)
-app.add_middleware(MetricsMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
+# ObservabilityMiddleware: request ID + latency metric + security headers,
+# fused into one pure ASGI layer (see app.core.middleware).
+app.add_middleware(ObservabilityMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # tighten in production
@@ -212,4 +190,7 @@ app.add_middleware(SlowAPIMiddleware)
 @app.get("/metrics", include_in_schema=False)
 async def metrics_endpoint():
     """Prometheus metrics scrape endpoint."""
-    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    # timed so scrape cost itself is visible (reported on the next scrape)
+    with SCRAPE_DURATION.time():
+        payload = render_latest()
+    return Response(payload, media_type=CONTENT_TYPE_LATEST)
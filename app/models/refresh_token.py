@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -8,13 +8,23 @@ from app.db.base import Base
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    # Serves per-user session eviction (newest N by expiry) and, through its
+    # leading column, the user_id FK lookups done by cascade deletes.
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id_expires_at", "user_id", "expires_at"),
+    )
+    # See User. Only ORM writes (admin edits) use this; the auth flow
+    # inserts tokens with a Core INSERT and never reads the defaults back.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True
+        Integer, ForeignKey("users.id", ondelete="CASCADE")
     )
-    token: Mapped[str] = mapped_column(
-        String(255), unique=True, nullable=False, index=True
+    # SHA-256 hex digest of the token handed to the client; the raw value
+    # is never stored. Fixed width keeps the unique index compact.
+    token_hash: Mapped[str] = mapped_column(
+        String(64), unique=True, nullable=False, index=True
     )
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False
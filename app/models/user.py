@@ -8,6 +8,10 @@ from app.db.base import Base
 
 class User(Base):
     __tablename__ = "users"
+    # ORM writes (the admin panel; UserService uses Core statements) get
+    # server-generated columns (id, created_at, updated_at) back via
+    # RETURNING on the INSERT/UPDATE itself instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     email: Mapped[str] = mapped_column(
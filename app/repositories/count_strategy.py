@@ -0,0 +1,63 @@
+from typing import Literal
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.base import Base
+
+# exact:     SELECT count(*) — always correct, scans the table.
+# estimated: planner statistics from pg_class, O(1); exact on non-Postgres.
+# cached:    exact count, reused for COUNT_CACHE_TTL_SECONDS per process.
+CountMode = Literal["exact", "estimated", "cached"]
+
+# Row counts for ?count=cached, keyed by table name (per process).
+count_cache: TTLCache[int] = TTLCache(
+    "row_count", maxsize=64, ttl=settings.COUNT_CACHE_TTL_SECONDS
+)
+
+# Same extrapolation the planner uses: tuples-per-page from the last
+# ANALYZE times the table's current size in pages. NULL when the table has
+# never been analyzed (reltuples = -1) or had no pages at the time.
+_ESTIMATE_SQL = text(
+    "SELECT CASE WHEN c.reltuples < 0 OR c.relpages = 0 THEN NULL "
+    "ELSE (c.reltuples / c.relpages * "
+    "(pg_relation_size(c.oid) / current_setting('block_size')::int))::bigint "
+    "END FROM pg_class c WHERE c.oid = CAST(:table AS regclass)"
+)
+
+
+async def exact_count(session: AsyncSession, model: type[Base]) -> int:
+    result = await session.execute(select(func.count()).select_from(model))
+    return result.scalar_one()
+
+
+async def estimated_count(session: AsyncSession, model: type[Base]) -> int:
+    if session.get_bind().dialect.name == "postgresql":
+        result = await session.execute(
+            _ESTIMATE_SQL, {"table": model.__tablename__}
+        )
+        estimate = result.scalar_one_or_none()
+        if estimate is not None:
+            return max(int(estimate), 0)
+    return await exact_count(session, model)
+
+
+async def cached_count(session: AsyncSession, model: type[Base]) -> int:
+    key = model.__tablename__
+    total = count_cache.get(key)
+    if total is None:
+        total = await exact_count(session, model)
+        count_cache.set(key, total)
+    return total
+
+
+async def count_rows(
+    session: AsyncSession, model: type[Base], mode: CountMode
+) -> int:
+    if mode == "estimated":
+        return await estimated_count(session, model)
+    if mode == "cached":
+        return await cached_count(session, model)
+    return await exact_count(session, model)
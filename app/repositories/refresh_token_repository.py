@@ -1,25 +1,98 @@
+from datetime import datetime
+
+from sqlalchemy import delete, exists, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.models.refresh_token import RefreshToken
+from app.models.user import User
 
 
 class RefreshTokenRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def create(self, token: RefreshToken) -> RefreshToken:
-        self.session.add(token)
-        await self.session.flush()
-        await self.session.refresh(token)
-        return token
+    async def create(self, user_id: int, token_hash: str, expires_at: datetime) -> None:
+        await self.session.execute(
+            insert(RefreshToken).values(
+                user_id=user_id, token_hash=token_hash, expires_at=expires_at
+            )
+        )
+
+    async def rotate(
+        self,
+        old_hash: str,
+        new_hash: str,
+        expires_at: datetime,
+        now: datetime,
+    ) -> int | None:
+        """Swap a valid token for a new one in a single UPDATE ... RETURNING.
 
-    async def get_by_token(self, token_str: str) -> RefreshToken | None:
+        Lookup, validity checks (not revoked, not expired, owner exists and
+        is active) and the rotation happen in one statement, so it costs one
+        round trip and two concurrent refreshes with the same token cannot
+        both succeed. Returns the owner's id, or None if the token was not
+        valid.
+        """
+        owner_active = exists().where(
+            User.id == RefreshToken.user_id, User.is_active.is_(True)
+        )
         result = await self.session.execute(
-            select(RefreshToken).where(RefreshToken.token == token_str)
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == old_hash,
+                RefreshToken.revoked.is_(False),
+                RefreshToken.expires_at > now,
+                owner_active,
+            )
+            .values(token_hash=new_hash, expires_at=expires_at, created_at=now)
+            .returning(RefreshToken.user_id)
+            .execution_options(synchronize_session=False)
         )
         return result.scalar_one_or_none()
 
-    async def delete(self, token: RefreshToken) -> None:
-        await self.session.delete(token)
-        await self.session.flush()
+    async def evict_excess(self, user_id: int, keep: int, now: datetime) -> int:
+        """Keep only the user's ``keep`` newest live tokens; returns rows deleted.
+
+        Everything else for that user goes in one DELETE: the oldest live
+        sessions beyond the cap plus any expired or revoked leftovers. Both
+        sides walk the (user_id, expires_at) index.
+        """
+        newest = (
+            select(RefreshToken.id)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked.is_(False),
+                RefreshToken.expires_at > now,
+            )
+            .order_by(RefreshToken.expires_at.desc())
+            .limit(keep)
+        )
+        result = await self.session.execute(
+            delete(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.id.not_in(newest.scalar_subquery()),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def delete_dead_batch(self, now: datetime, limit: int) -> int:
+        """Delete up to ``limit`` expired or revoked tokens; returns the count.
+
+        Bounded batches keep each DELETE (and its row locks) short, and
+        SKIP LOCKED lets concurrent reapers in other workers share the work
+        instead of queueing behind each other.
+        """
+        dead_ids = (
+            select(RefreshToken.id)
+            .where(or_(RefreshToken.expires_at <= now, RefreshToken.revoked))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(dead_ids.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
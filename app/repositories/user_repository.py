@@ -1,9 +1,36 @@
-import asyncio
+from collections.abc import AsyncIterator, Collection, Sequence
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    Integer,
+    Row,
+    String,
+    any_,
+    bindparam,
+    delete,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.models.user import User
+from app.repositories.count_strategy import CountMode, count_rows
+
+# What list reads select: the public profile columns (the fields of
+# UserRead), never hashed_password. Rows come back as plain Core tuples —
+# no identity map, no change tracking — for read-only listing.
+READ_COLUMNS = (
+    User.id,
+    User.email,
+    User.full_name,
+    User.is_active,
+    User.is_superuser,
+    User.created_at,
+    User.updated_at,
+)
 
 
 class UserRepository:
@@ -18,26 +45,153 @@ class UserRepository:
         result = await self.session.execute(select(User).where(User.email == email))
         return result.scalar_one_or_none()
 
-    async def list(self, limit: int = 20, offset: int = 0) -> tuple[list[User], int]:
-        # Run count and fetch concurrently — avoids sequential round-trips.
-        count_q = self.session.execute(select(func.count()).select_from(User))
-        rows_q = self.session.execute(
-            select(User).order_by(User.id).limit(limit).offset(offset)
-        )
-        count_result, rows_result = await asyncio.gather(count_q, rows_q)
-        return list(rows_result.scalars().all()), count_result.scalar_one()
-
-    async def create(self, user: User) -> User:
-        self.session.add(user)
-        await self.session.flush()
-        await self.session.refresh(user)
-        return user
-
-    async def update(self, user: User) -> User:
-        await self.session.flush()
-        await self.session.refresh(user)
-        return user
-
-    async def delete(self, user: User) -> None:
-        await self.session.delete(user)
-        await self.session.flush()
+    def _one_of(
+        self, column: Any, values: Collection[Any], item_type: Any
+    ) -> ColumnElement[bool]:
+        # On PostgreSQL "= ANY(:values)" binds a single array parameter, so
+        # every batch size shares one (prepared) statement; an expanding
+        # IN would compile a new one per distinct length.
+        if self.session.get_bind().dialect.name == "postgresql":
+            array = postgresql.ARRAY(item_type)
+            return column == any_(bindparam(None, list(values), type_=array))
+        return column.in_(values)
+
+    async def get_many_by_ids(self, ids: Collection[int]) -> list[User]:
+        """Users with any of ``ids`` in one query; unknown ids are skipped."""
+        if not ids:
+            return []
+        result = await self.session.execute(
+            select(User).where(self._one_of(User.id, ids, Integer))
+        )
+        return list(result.scalars().all())
+
+    async def get_many_by_emails(self, emails: Collection[str]) -> list[User]:
+        """Users with any of ``emails`` in one query; unknown ones skipped."""
+        if not emails:
+            return []
+        result = await self.session.execute(
+            select(User).where(self._one_of(User.email, emails, String))
+        )
+        return list(result.scalars().all())
+
+    async def existing_emails(self, emails: Collection[str]) -> set[str]:
+        """Which of ``emails`` are already registered, in one query."""
+        if not emails:
+            return set()
+        result = await self.session.execute(
+            select(User.email).where(self._one_of(User.email, emails, String))
+        )
+        return set(result.scalars())
+
+    async def insert_many(self, rows: list[dict[str, Any]]) -> dict[str, int]:
+        """Insert users in batched multi-row INSERTs; returns ``{email: id}``.
+
+        ``ON CONFLICT (email) DO NOTHING``: a row whose email was taken in
+        the meantime is skipped instead of aborting the transaction, and is
+        simply missing from the result.
+        """
+        if not rows:
+            return {}
+        result = await self.session.execute(
+            self._insert_new_email().returning(User.email, User.id), rows
+        )
+        return {email: user_id for email, user_id in result.all()}
+
+    def _insert_new_email(self) -> Any:
+        # INSERT ... ON CONFLICT (email) DO NOTHING (PostgreSQL and SQLite)
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        return insert(User).on_conflict_do_nothing(index_elements=[User.email])
+
+    async def insert_returning(self, values: dict[str, Any]) -> Row | None:
+        """Create a user in one statement; returns its ``READ_COLUMNS`` row.
+
+        ``None`` when the email is already registered — the unique index
+        decides, so there is no separate lookup and no race window.
+        """
+        result = await self.session.execute(
+            self._insert_new_email().values(**values).returning(*READ_COLUMNS)
+        )
+        return result.one_or_none()
+
+    async def update_returning(
+        self, user_id: int, values: dict[str, Any]
+    ) -> Row | None:
+        """``UPDATE ... WHERE id = :id RETURNING`` the ``READ_COLUMNS``.
+
+        ``None`` when there is no such user. Setting an email that belongs
+        to another user raises ``IntegrityError`` from the unique index.
+        """
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(**values)
+            .returning(*READ_COLUMNS)
+        )
+        return result.one_or_none()
+
+    async def delete_returning(self, user_id: int) -> bool:
+        """Delete by id in one statement (refresh tokens go with it via
+        ``ON DELETE CASCADE``); False when there was no such user."""
+        result = await self.session.execute(
+            delete(User).where(User.id == user_id).returning(User.id)
+        )
+        return result.one_or_none() is not None
+
+    async def list_after(self, after_id: int | None, limit: int) -> list[Row]:
+        """Keyset page ordered by id: rows strictly after ``after_id``.
+
+        Uses the primary-key index to seek, so cost does not grow with depth.
+        Returns ``READ_COLUMNS`` rows, not ``User`` instances.
+        """
+        stmt = select(*READ_COLUMNS).order_by(User.id).limit(limit)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id)
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    async def stream_read_rows(self, batch_size: int) -> AsyncIterator[Sequence[Row]]:
+        """Every user's ``READ_COLUMNS`` in id order, ``batch_size`` at a time.
+
+        Reads through a server-side cursor, so memory stays flat at any
+        table size. Needs a transactional (non-AUTOCOMMIT) session.
+        """
+        result = await self.session.stream(
+            select(*READ_COLUMNS)
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def count(self, mode: CountMode = "exact") -> int:
+        return await count_rows(self.session, User, mode)
+
+    async def list(
+        self, limit: int = 20, offset: int = 0, count: CountMode = "exact"
+    ) -> tuple[list[Row], int]:
+        """Offset page of ``READ_COLUMNS`` rows plus the total row count."""
+        if count != "exact":
+            result = await self.session.execute(
+                select(*READ_COLUMNS).order_by(User.id).limit(limit).offset(offset)
+            )
+            return list(result.all()), await self.count(count)
+
+        # One statement, one round trip: count(*) OVER () is evaluated before
+        # LIMIT/OFFSET, so every returned row carries the full total. (An
+        # AsyncSession cannot run two statements concurrently, so gathering a
+        # separate count query on it only ever serialized them.)
+        total_col = func.count().over().label("total")
+        result = await self.session.execute(
+            select(*READ_COLUMNS, total_col)
+            .order_by(User.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        rows = result.all()
+        if rows:
+            # the extra "total" column is ignored when rows become UserRead
+            return list(rows), rows[0].total
+        # Page past the end (or empty table): no row to carry the total.
+        return [], await self.count("exact")
+
@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 
 
@@ -50,6 +52,24 @@ class UserRead(UserBase):
 
 class UserPage(BaseModel):
     items: list[UserRead]
-    total: int
+    # omitted (null) in cursor mode, where counting would defeat the purpose
+    total: int | None
     limit: int
-    offset: int
+    offset: int | None
+    # pass back as ?cursor= to fetch the next page; null on the last page
+    next_cursor: str | None = None
+
+
+class BulkUserResult(BaseModel):
+    line: int  # 1-based line of the NDJSON request body
+    status: Literal["created", "conflict", "invalid"]
+    id: int | None = None
+    email: str | None = None
+    error: str | None = None
+
+
+class BulkImportReport(BaseModel):
+    created: int
+    conflicts: int
+    invalid: int
+    results: list[BulkUserResult]
@@ -5,8 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.exceptions import UnauthorizedException
-from app.core.security import create_access_token, verify_password
-from app.models.refresh_token import RefreshToken
+from app.core.security import (
+    create_access_token,
+    hash_refresh_token,
+    verify_password_async,
+)
 from app.repositories.user_repository import UserRepository
 from app.repositories.refresh_token_repository import RefreshTokenRepository
 from app.schemas.token import Token
@@ -20,40 +23,43 @@ class AuthService:
 
     async def authenticate(self, email: str, password: str) -> Token:
         user = await self.repo.get_by_email(email)
-        if not user or not verify_password(password, user.hashed_password):
+        if not user or not await verify_password_async(
+            password, user.hashed_password
+        ):
             raise UnauthorizedException("Invalid email or password")
         if not user.is_active:
             raise UnauthorizedException("Inactive user")
 
         access_token = create_access_token(subject=user.id)
-        async with self.session.begin_nested():
-            rt = await self._create_refresh_token(user.id)
-
-        return Token(access_token=access_token, refresh_token=rt.token)
+        # runs in the request transaction: the new session and the eviction
+        # of the oldest ones over the cap commit (or roll back) together
+        refresh_token = secrets.token_urlsafe(32)
+        await self.refresh_repo.create(
+            user.id, hash_refresh_token(refresh_token), self._refresh_expiry()
+        )
+        await self.refresh_repo.evict_excess(
+            user.id,
+            keep=settings.MAX_ACTIVE_SESSIONS_PER_USER,
+            now=datetime.now(timezone.utc),
+        )
+        return Token(access_token=access_token, refresh_token=refresh_token)
 
     async def refresh(self, refresh_token: str) -> Token:
-        rt = await self.refresh_repo.get_by_token(refresh_token)
-        if not rt or rt.revoked:
-            raise UnauthorizedException("Invalid refresh token")
-        if rt.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
-            raise UnauthorizedException("Invalid refresh token")
-
-        user = await self.repo.get_by_id(rt.user_id)
-        if not user:
+        new_token = secrets.token_urlsafe(32)
+        user_id = await self.refresh_repo.rotate(
+            old_hash=hash_refresh_token(refresh_token),
+            new_hash=hash_refresh_token(new_token),
+            expires_at=self._refresh_expiry(),
+            now=datetime.now(timezone.utc),
+        )
+        if user_id is None:
             raise UnauthorizedException("Invalid refresh token")
 
-        access = create_access_token(subject=user.id)
-        async with self.session.begin_nested():
-            await self.refresh_repo.delete(rt)
-            new_rt = await self._create_refresh_token(user.id)
-
-        return Token(access_token=access, refresh_token=new_rt.token)
+        access = create_access_token(subject=user_id)
+        return Token(access_token=access, refresh_token=new_token)
 
-    async def _create_refresh_token(self, user_id: int) -> RefreshToken:
-        """Creates and persists a new refresh token for the given user."""
-        token = secrets.token_urlsafe(32)
-        expires = datetime.now(timezone.utc) + timedelta(
+    @staticmethod
+    def _refresh_expiry() -> datetime:
+        return datetime.now(timezone.utc) + timedelta(
             days=settings.REFRESH_TOKEN_EXPIRE_DAYS
         )
-        rt = RefreshToken(user_id=user_id, token=token, expires_at=expires)
-        return await self.refresh_repo.create(rt)
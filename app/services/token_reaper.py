@@ -0,0 +1,57 @@
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import REFRESH_TOKEN_REAP_SECONDS, REFRESH_TOKENS_REAPED
+from app.db.session import AsyncSessionLocal
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+
+
+async def reap_refresh_tokens(
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    batch_size: int | None = None,
+    batch_delay: float | None = None,
+) -> int:
+    """Delete every expired or revoked refresh token, one batch at a time.
+
+    Each batch runs in its own short transaction, and the pause between
+    batches caps the delete rate so the pass never competes with live
+    traffic for long. Returns the number of rows removed.
+    """
+    batch_size = batch_size or settings.REFRESH_TOKEN_REAPER_BATCH_SIZE
+    if batch_delay is None:
+        batch_delay = settings.REFRESH_TOKEN_REAPER_BATCH_DELAY_SECONDS
+
+    start = time.perf_counter()
+    total = 0
+    while True:
+        async with session_factory() as session:
+            async with session.begin():
+                deleted = await RefreshTokenRepository(session).delete_dead_batch(
+                    now=datetime.now(timezone.utc), limit=batch_size
+                )
+        total += deleted
+        REFRESH_TOKENS_REAPED.inc(deleted)
+        if deleted < batch_size:
+            break
+        await asyncio.sleep(batch_delay)
+
+    elapsed = time.perf_counter() - start
+    REFRESH_TOKEN_REAP_SECONDS.observe(elapsed)
+    logger.info("Reaped %d refresh tokens in %.2fs", total, elapsed)
+    return total
+
+
+async def run_token_reaper(interval: float) -> None:
+    """Run ``reap_refresh_tokens`` every ``interval`` seconds, forever."""
+    while True:
+        try:
+            await reap_refresh_tokens()
+        except Exception:
+            logger.exception("Refresh token reaper pass failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,58 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Callable, Sequence
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.user_repository import READ_COLUMNS, UserRepository
+from app.schemas.user import UserRead
+from app.services.user_service import read_from_row
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+_CSV_HEADER = [column.key for column in READ_COLUMNS]
+_serializer = UserRead.__pydantic_serializer__
+
+
+def _ndjson_chunk(rows: Sequence[Row]) -> bytes:
+    return b"".join(_serializer.to_json(read_from_row(row)) + b"\n" for row in rows)
+
+
+def _csv_chunk(rows: Sequence[Row]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [v.isoformat() if isinstance(v, datetime) else v for v in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def export_users(
+    session_factory: Callable[[], AbstractAsyncContextManager[AsyncSession]],
+    fmt: ExportFormat,
+    batch_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """Every user as NDJSON lines or CSV rows, one chunk per cursor batch.
+
+    Opens its own session (see ``get_session_factory``); closing the
+    generator — e.g. when the client disconnects — closes the cursor.
+    """
+    if fmt == "csv":
+        yield _csv_chunk([_CSV_HEADER])
+    encode = _csv_chunk if fmt == "csv" else _ndjson_chunk
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    async with session_factory() as session:
+        repo = UserRepository(session)
+        async for rows in repo.stream_read_rows(batch_size):
+            yield encode(rows)
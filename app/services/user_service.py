@@ -1,13 +1,53 @@
+from collections.abc import AsyncIterable
+
+from pydantic import ValidationError
+from sqlalchemy import Row, event
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from app.core.exceptions import ConflictException, NotFoundException
-from app.core.security import hash_password
+from app.core.cache import principal_cache
+from app.core.config import settings
+from app.core.dataloader import DataLoader
+from app.core.exceptions import (
+    ConflictException,
+    NotFoundException,
+    PayloadTooLargeException,
+)
+from app.core.logging import user_id_ctx_var
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.security import hash_password_async, hash_passwords_async
+from app.db.replicas import mark_recent_write
 from app.models.user import User
+from app.repositories.count_strategy import CountMode
 from app.repositories.user_repository import UserRepository
-from app.schemas.user import UserCreate, UserPage, UserRead, UserUpdate
+from app.schemas.user import (
+    BulkImportReport,
+    BulkUserResult,
+    UserCreate,
+    UserPage,
+    UserRead,
+    UserUpdate,
+)
 
 _EMAIL_CONFLICT = "Email already registered"
+# session.info key: principals to drop again once the write commits
+_STALE_PRINCIPALS = "stale_principals"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session: Session) -> None:
+    # A concurrent request may have read the old row and re-cached it
+    # between the in-transaction invalidate and this commit.
+    for user_id in session.info.pop(_STALE_PRINCIPALS, ()):
+        principal_cache.invalidate(user_id)
+
+
+def read_from_row(row: Row) -> UserRead:
+    # Rows are UserRepository.READ_COLUMNS straight from the database, which
+    # only ever holds validated data: skip re-validation (EmailStr checks
+    # dominate it) and build the model directly.
+    return UserRead.model_construct(**row._mapping)
 
 
 class UserService:
@@ -15,21 +55,112 @@ class UserService:
         self.session = session
         self.repo = UserRepository(session)
 
+    def _invalidate_principal(self, user_id: int) -> None:
+        """Drop the cached principal now and again after commit."""
+        principal_cache.invalidate(user_id)
+        self.session.info.setdefault(_STALE_PRINCIPALS, set()).add(user_id)
+
     async def create_user(self, data: UserCreate) -> UserRead:
-        existing = await self.repo.get_by_email(data.email)
-        if existing:
-            raise ConflictException(_EMAIL_CONFLICT)
-        user = User(
-            email=data.email,
-            hashed_password=hash_password(data.password),
-            full_name=data.full_name,
+        # One round trip: INSERT ... ON CONFLICT DO NOTHING RETURNING. No row
+        # back means the email is taken. (Taken emails now also pay for the
+        # hash, which keeps the response time from revealing them.)
+        row = await self.repo.insert_returning(
+            {
+                "email": data.email,
+                "hashed_password": await hash_password_async(data.password),
+                "full_name": data.full_name,
+            }
         )
-        try:
-            async with self.session.begin_nested():
-                user = await self.repo.create(user)
-        except IntegrityError:
+        if row is None:
             raise ConflictException(_EMAIL_CONFLICT)
-        return UserRead.model_validate(user)
+        mark_recent_write(row.id)
+        return read_from_row(row)
+
+    async def import_users(self, lines: AsyncIterable[bytes]) -> BulkImportReport:
+        """Create users from NDJSON lines (one ``UserCreate`` each).
+
+        Rows are handled in batches of ``BULK_IMPORT_BATCH_SIZE``: one
+        query finds taken emails, only the remaining passwords are hashed
+        (in parallel on the worker pool), and one batched INSERT ... ON
+        CONFLICT DO NOTHING stores them. Bad or conflicting rows are
+        reported per line and never abort the import.
+        """
+        results: list[BulkUserResult] = []
+        batch: list[tuple[int, UserCreate]] = []
+        seen: set[str] = set()
+        rows = 0
+        line_no = 0
+        async for line in lines:
+            line_no += 1
+            if not line.strip():
+                continue
+            rows += 1
+            if rows > settings.BULK_IMPORT_MAX_ROWS:
+                # raising rolls back the request transaction: nothing is kept
+                raise PayloadTooLargeException(
+                    f"At most {settings.BULK_IMPORT_MAX_ROWS} rows per import"
+                )
+            try:
+                data = UserCreate.model_validate_json(line)
+            except ValidationError as exc:
+                error = exc.errors()[0]
+                results.append(
+                    BulkUserResult(
+                        line=line_no,
+                        status="invalid",
+                        error=f"{'.'.join(map(str, error['loc']))}: {error['msg']}",
+                    )
+                )
+                continue
+            if data.email in seen:
+                # repeated within this import
+                results.append(
+                    BulkUserResult(line=line_no, status="conflict", email=data.email)
+                )
+                continue
+            seen.add(data.email)
+            batch.append((line_no, data))
+            if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+                results.extend(await self._import_batch(batch))
+                batch = []
+        results.extend(await self._import_batch(batch))
+        results.sort(key=lambda r: r.line)
+
+        created = sum(r.status == "created" for r in results)
+        invalid = sum(r.status == "invalid" for r in results)
+        mark_recent_write(user_id_ctx_var.get())
+        return BulkImportReport(
+            created=created,
+            conflicts=len(results) - created - invalid,
+            invalid=invalid,
+            results=results,
+        )
+
+    async def _import_batch(
+        self, batch: list[tuple[int, UserCreate]]
+    ) -> list[BulkUserResult]:
+        taken = await self.repo.existing_emails([data.email for _, data in batch])
+        fresh = [data for _, data in batch if data.email not in taken]
+        hashes = await hash_passwords_async([data.password for data in fresh])
+        inserted = await self.repo.insert_many(
+            [
+                {
+                    "email": data.email,
+                    "hashed_password": hashed,
+                    "full_name": data.full_name,
+                }
+                for data, hashed in zip(fresh, hashes)
+            ]
+        )
+        return [
+            BulkUserResult(
+                line=line_no,
+                status="created" if data.email in inserted else "conflict",
+                id=inserted.get(data.email),
+                email=data.email,
+            )
+            for line_no, data in batch
+        ]
 
     async def get_user(self, user_id: int) -> UserRead:
         user = await self.repo.get_by_id(user_id)
@@ -37,40 +168,76 @@ class UserService:
             raise NotFoundException(f"User {user_id} not found")
         return UserRead.model_validate(user)
 
-    async def list_users(self, limit: int = 20, offset: int = 0) -> UserPage:
-        users, total = await self.repo.list(limit=limit, offset=offset)
+    async def get_users(
+        self, ids: list[int], loader: DataLoader[int, User]
+    ) -> UserPage:
+        """Users with the given ids, in request order; unknown ids skipped."""
+        unique = list(dict.fromkeys(ids))
+        users = [u for u in await loader.load_many(unique) if u is not None]
         return UserPage(
             items=[UserRead.model_validate(u) for u in users],
+            total=len(users),
+            limit=len(unique),
+            offset=None,
+        )
+
+    async def list_users(
+        self, limit: int = 20, offset: int = 0, count: CountMode = "exact"
+    ) -> UserPage:
+        users, total = await self.repo.list(limit=limit, offset=offset, count=count)
+        # an estimated/cached total may lag, so also trust a full page
+        has_more = bool(users) and (
+            offset + len(users) < total or (count != "exact" and len(users) == limit)
+        )
+        return UserPage(
+            items=[read_from_row(u) for u in users],
             total=total,
             limit=limit,
             offset=offset,
+            next_cursor=encode_cursor(users[-1].id) if has_more else None,
+        )
+
+    async def list_users_after(
+        self, cursor: str | None, limit: int = 20, count: CountMode | None = None
+    ) -> UserPage:
+        """Keyset pagination — constant cost at any depth.
+
+        No count query unless ``count`` asks for one.
+        """
+        after_id = decode_cursor(cursor) if cursor else None
+        # fetch one extra row to learn whether another page exists
+        users = await self.repo.list_after(after_id, limit + 1)
+        has_more = len(users) > limit
+        users = users[:limit]
+        return UserPage(
+            items=[read_from_row(u) for u in users],
+            total=await self.repo.count(count) if count else None,
+            limit=limit,
+            offset=None,
+            next_cursor=encode_cursor(users[-1].id) if has_more else None,
         )
 
     async def update_user(self, user_id: int, data: UserUpdate) -> UserRead:
-        user = await self.repo.get_by_id(user_id)
-        if not user:
-            raise NotFoundException(f"User {user_id} not found")
-        if data.email is not None and data.email != user.email:
-            conflict = await self.repo.get_by_email(data.email)
-            if conflict:
-                raise ConflictException(_EMAIL_CONFLICT)
-            user.email = data.email
-        if data.full_name is not None:
-            user.full_name = data.full_name
+        values = data.model_dump(exclude_none=True, exclude={"password"})
         if data.password is not None:
-            user.hashed_password = hash_password(data.password)
-        if data.is_active is not None:
-            user.is_active = data.is_active
+            values["hashed_password"] = await hash_password_async(data.password)
+        if not values:
+            return await self.get_user(user_id)
+        # One round trip: UPDATE ... RETURNING. No row means no such user; a
+        # taken email trips the unique index. That error aborts the request
+        # transaction on PostgreSQL, which is fine — the request fails.
         try:
-            async with self.session.begin_nested():
-                user = await self.repo.update(user)
+            row = await self.repo.update_returning(user_id, values)
         except IntegrityError:
             raise ConflictException(_EMAIL_CONFLICT)
-        return UserRead.model_validate(user)
+        if row is None:
+            raise NotFoundException(f"User {user_id} not found")
+        self._invalidate_principal(user_id)
+        mark_recent_write(user_id, user_id_ctx_var.get())
+        return read_from_row(row)
 
     async def delete_user(self, user_id: int) -> None:
-        user = await self.repo.get_by_id(user_id)
-        if not user:
+        if not await self.repo.delete_returning(user_id):
             raise NotFoundException(f"User {user_id} not found")
-        async with self.session.begin_nested():
-            await self.repo.delete(user)
+        self._invalidate_principal(user_id)
+        mark_recent_write(user_id_ctx_var.get())
@@ -0,0 +1,6 @@
+import os
+
+# Benchmarks import app modules, which build Settings at import time.
+# Provide throwaway values so they run without a .env file.
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./bench.db")
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key")
@@ -0,0 +1,56 @@
+"""Cost of rendering /metrics: raw URL path labels vs route-template labels.
+
+Simulates traffic spread over many distinct user ids and times
+``generate_latest`` for each labelling scheme. Run from the project root:
+
+    python -m benchmarks.bench_metrics
+"""
+
+import time
+
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+
+from app.core.config import settings
+
+DISTINCT_USERS = (100, 1_000, 10_000)
+ROUNDS = 20
+
+
+def _build() -> tuple[CollectorRegistry, Histogram]:
+    registry = CollectorRegistry()
+    hist = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency",
+        ["method", "path", "status_code"],
+        buckets=settings.METRICS_LATENCY_BUCKETS,
+        registry=registry,
+    )
+    return registry, hist
+
+
+def _time_scrape(registry: CollectorRegistry) -> tuple[float, int]:
+    payload = generate_latest(registry)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        generate_latest(registry)
+    return (time.perf_counter() - start) / ROUNDS * 1e3, len(payload)
+
+
+def main() -> None:
+    print(f"{'users':>7} {'scheme':>9} {'scrape ms':>10} {'payload KB':>11}")
+    for n in DISTINCT_USERS:
+        for scheme in ("raw", "template"):
+            registry, hist = _build()
+            for user_id in range(n):
+                path = (
+                    f"/api/v1/users/{user_id}"
+                    if scheme == "raw"
+                    else "/api/v1/users/{user_id}"
+                )
+                hist.labels("GET", path, 200).observe(0.01)
+            ms, size = _time_scrape(registry)
+            print(f"{n:>7} {scheme:>9} {ms:>10.2f} {size / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Per-request middleware overhead: BaseHTTPMiddleware stack vs fused ASGI.
+
+Drives the ASGI app directly (no HTTP client, no socket) so the numbers
+isolate middleware cost. Run from the project root:
+
+    python -m benchmarks.bench_middleware
+"""
+
+import asyncio
+import time
+import uuid
+
+from prometheus_client import CollectorRegistry, Histogram
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.logging import request_id_ctx_var
+from app.core.middleware import ObservabilityMiddleware
+
+N = 20_000
+
+_legacy_latency = Histogram(
+    "legacy_http_request_duration_seconds",
+    "HTTP request latency (benchmark copy)",
+    ["method", "path", "status_code"],
+    registry=CollectorRegistry(),
+)
+
+
+# --- the stack app.main used before the fused middleware ---
+class RequestIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        rid = str(uuid.uuid4())
+        request_id_ctx_var.set(rid)
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = rid
+        return response
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start = time.time()
+        response = await call_next(request)
+        _legacy_latency.labels(
+            request.method, request.url.path, response.status_code
+        ).observe(time.time() - start)
+        return response
+
+
+class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["Strict-Transport-Security"] = (
+            "max-age=63072000; includeSubDomains; preload"
+        )
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["Referrer-Policy"] = "same-origin"
+        return response
+
+
+async def _ok(request):
+    return PlainTextResponse("ok")
+
+
+def _make_app(*middlewares) -> Starlette:
+    app = Starlette(routes=[Route("/", _ok)])
+    for mw in middlewares:
+        app.add_middleware(mw)
+    return app
+
+
+_SCOPE = {
+    "type": "http",
+    "asgi": {"version": "3.0"},
+    "http_version": "1.1",
+    "method": "GET",
+    "scheme": "http",
+    "path": "/",
+    "raw_path": b"/",
+    "root_path": "",
+    "query_string": b"",
+    "headers": [(b"host", b"bench")],
+    "client": ("127.0.0.1", 1234),
+    "server": ("bench", 80),
+}
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, n: int) -> float:
+    for _ in range(200):  # warm-up (builds the middleware stack lazily)
+        await app(dict(_SCOPE), _receive, _send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(_SCOPE), _receive, _send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    baseline = await _run(_make_app(), N)
+    legacy = await _run(
+        _make_app(SecurityHeadersMiddleware, MetricsMiddleware, RequestIdMiddleware),
+        N,
+    )
+    fused = await _run(_make_app(ObservabilityMiddleware), N)
+    print(f"requests per variant: {N}")
+    print(f"no middleware:               {baseline:8.1f} us/request")
+    print(
+        f"BaseHTTPMiddleware x3:       {legacy:8.1f} us/request "
+        f"(+{legacy - baseline:.1f})"
+    )
+    print(
+        f"ObservabilityMiddleware:     {fused:8.1f} us/request "
+        f"(+{fused - baseline:.1f})"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
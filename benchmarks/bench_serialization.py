@@ -0,0 +1,135 @@
+"""Response serialization cost for UserRead and a 100-item UserPage.
+
+Three variants of the same route, driven through the ASGI app directly:
+
+- default: FastAPI's path (model -> dict -> response_model validation ->
+  jsonable dict -> stdlib ``json.dumps``)
+- fast class: same route with ``FastJSONResponse`` as response class (only
+  the final ``json.dumps`` is replaced)
+- direct: route returns ``FastJSONResponse(model)`` (one pass in
+  pydantic-core, no re-validation) — what the v1 read routes do
+
+Run from the project root:
+
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, FastAPI
+
+from app.core.responses import FastJSONResponse
+from app.schemas.user import UserPage, UserRead
+
+N = 5_000
+
+_now = datetime.now(timezone.utc)
+_USER = UserRead(
+    id=1,
+    email="bench@example.com",
+    full_name="Bench User",
+    is_active=True,
+    is_superuser=False,
+    created_at=_now,
+    updated_at=_now,
+)
+_PAGE = UserPage(
+    items=[
+        _USER.model_copy(update={"id": i, "email": f"user{i}@example.com"})
+        for i in range(100)
+    ],
+    total=10_000,
+    limit=100,
+    offset=0,
+    next_cursor="MTAw",
+)
+
+
+def _make_app() -> FastAPI:
+    app = FastAPI()
+    fast = APIRouter(default_response_class=FastJSONResponse)
+
+    @app.get("/default/user", response_model=UserRead)
+    async def default_user():
+        return _USER
+
+    @app.get("/default/page", response_model=UserPage)
+    async def default_page():
+        return _PAGE
+
+    @fast.get("/class/user", response_model=UserRead)
+    async def class_user():
+        return _USER
+
+    @fast.get("/class/page", response_model=UserPage)
+    async def class_page():
+        return _PAGE
+
+    @app.get("/direct/user", response_model=UserRead)
+    async def direct_user():
+        return FastJSONResponse(_USER)
+
+    @app.get("/direct/page", response_model=UserPage)
+    async def direct_page():
+        return FastJSONResponse(_PAGE)
+
+    app.include_router(fast)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, path: str, n: int) -> float:
+    scope = _scope(path)
+    for _ in range(200):  # warm-up
+        await app(dict(scope), _receive, _send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), _receive, _send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    app = _make_app()
+    print(f"requests per variant: {N}")
+    for kind in ("user", "page"):
+        default = await _run(app, f"/default/{kind}", N)
+        fast_class = await _run(app, f"/class/{kind}", N)
+        direct = await _run(app, f"/direct/{kind}", N)
+        label = "UserRead" if kind == "user" else "UserPage (100 items)"
+        print(f"{label}:")
+        print(f"  default:    {default:8.1f} us/request")
+        print(
+            f"  fast class: {fast_class:8.1f} us/request "
+            f"({default / fast_class:.1f}x)"
+        )
+        print(f"  direct:     {direct:8.1f} us/request ({default / direct:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedException
+from app.core.security import hash_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.schemas.user import UserCreate
+from app.services.auth_service import AuthService
+from app.services.user_service import UserService
+from tests.conftest import TEST_PASSWORD
+
+
+async def _login(db_session: AsyncSession, email: str) -> tuple[int, str]:
+    user = await UserService(db_session).create_user(
+        UserCreate(email=email, password=TEST_PASSWORD)
+    )
+    tokens = await AuthService(db_session).authenticate(email, TEST_PASSWORD)
+    return user.id, tokens.refresh_token
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_stored_hashed(db_session: AsyncSession) -> None:
+    user_id, refresh_token = await _login(db_session, "hashed_rt@example.com")
+    stored = (
+        await db_session.execute(
+            select(RefreshToken.token_hash).where(RefreshToken.user_id == user_id)
+        )
+    ).scalar_one()
+    assert stored != refresh_token
+    assert stored == hash_refresh_token(refresh_token)
+    assert len(stored) == 64
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_in_place(db_session: AsyncSession) -> None:
+    user_id, refresh_token = await _login(db_session, "rotate_rt@example.com")
+    service = AuthService(db_session)
+
+    new_tokens = await service.refresh(refresh_token)
+    assert new_tokens.refresh_token != refresh_token
+
+    # the old token is gone, the new one works exactly once more
+    with pytest.raises(UnauthorizedException):
+        await service.refresh(refresh_token)
+    await service.refresh(new_tokens.refresh_token)
+
+    rows = (
+        await db_session.execute(
+            select(RefreshToken.id).where(RefreshToken.user_id == user_id)
+        )
+    ).all()
+    assert len(rows) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_rejects_expired_and_inactive(db_session: AsyncSession) -> None:
+    user_id, refresh_token = await _login(db_session, "expired_rt@example.com")
+    service = AuthService(db_session)
+    await db_session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id)
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(minutes=1))
+    )
+    with pytest.raises(UnauthorizedException):
+        await service.refresh(refresh_token)
+
+    inactive_id, inactive_token = await _login(db_session, "inactive_rt@example.com")
+    await db_session.execute(
+        update(User).where(User.id == inactive_id).values(is_active=False)
+    )
+    with pytest.raises(UnauthorizedException):
+        await service.refresh(inactive_token)
+
+
+@pytest.mark.asyncio
+async def test_login_evicts_sessions_over_cap(
+    db_session: AsyncSession, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "MAX_ACTIVE_SESSIONS_PER_USER", 2)
+    user_id, first_token = await _login(db_session, "cap_rt@example.com")
+    service = AuthService(db_session)
+    tokens = [first_token]
+    for _ in range(3):
+        login = await service.authenticate("cap_rt@example.com", TEST_PASSWORD)
+        tokens.append(login.refresh_token)
+
+    rows = (
+        await db_session.execute(
+            select(RefreshToken.id).where(RefreshToken.user_id == user_id)
+        )
+    ).all()
+    assert len(rows) == 2
+
+    # the two oldest sessions were evicted, the newest still refreshes
+    for old in tokens[:2]:
+        with pytest.raises(UnauthorizedException):
+            await service.refresh(old)
+    await service.refresh(tokens[-1])
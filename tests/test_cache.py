@@ -0,0 +1,34 @@
+import time
+
+from app.core.cache import TTLCache
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[int] = TTLCache("test_lru", maxsize=2, ttl=60)
+    cache.set(1, 1)
+    cache.set(2, 2)
+    assert cache.get(1) == 1  # 1 becomes most recently used
+    cache.set(3, 3)
+    assert cache.get(2) is None
+    assert cache.get(1) == 1
+    assert cache.get(3) == 3
+
+
+def test_cache_entries_expire(monkeypatch) -> None:
+    cache: TTLCache[str] = TTLCache("test_ttl", maxsize=10, ttl=5)
+    cache.set("k", "v")
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_cache_invalidate_and_disabled() -> None:
+    cache: TTLCache[str] = TTLCache("test_inv", maxsize=10, ttl=60)
+    cache.set("k", "v")
+    cache.invalidate("k")
+    assert cache.get("k") is None
+
+    disabled: TTLCache[str] = TTLCache("test_off", maxsize=10, ttl=0)
+    disabled.set("k", "v")
+    assert disabled.get("k") is None
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.core.dataloader import DataLoader
+
+
+def _recording_loader(calls: list[list[int]]) -> DataLoader[int, str]:
+    async def batch(keys: list[int]) -> dict[int, str]:
+        calls.append(sorted(keys))
+        return {key: f"user{key}" for key in keys if key < 100}
+
+    return DataLoader(batch)
+
+
+@pytest.mark.asyncio
+async def test_loads_in_same_tick_share_one_batch() -> None:
+    calls: list[list[int]] = []
+    loader = _recording_loader(calls)
+
+    async def resolve(key: int) -> str | None:
+        return await loader.load(key)
+
+    results = await asyncio.gather(resolve(1), resolve(2), resolve(1), resolve(404))
+    assert results == ["user1", "user2", "user1", None]
+    assert calls == [[1, 2, 404]]
+
+    # memoized for the loader's lifetime; only new keys hit the batch fn
+    assert await loader.load_many([2, 3]) == ["user2", "user3"]
+    assert calls == [[1, 2, 404], [3]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_can_be_retried() -> None:
+    attempts = 0
+
+    async def flaky(keys: list[int]) -> dict[int, int]:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionError("db went away")
+        return {key: key for key in keys}
+
+    loader: DataLoader[int, int] = DataLoader(flaky)
+    with pytest.raises(ConnectionError):
+        await loader.load(7)
+    assert await loader.load(7) == 7
+
+
+@pytest.mark.asyncio
+async def test_cancelled_load_is_not_memoized() -> None:
+    calls: list[list[int]] = []
+    loader = _recording_loader(calls)
+
+    waiter = asyncio.ensure_future(loader.load(5))
+    await asyncio.sleep(0)
+    waiter.cancel()  # the waiter gives up before its batch runs
+    await asyncio.sleep(0)
+    assert await loader.load(5) == "user5"
+
+    # a batch that finishes after its waiter was cancelled is forgotten too
+    future = loader.load(6)
+    future.cancel()
+    await asyncio.sleep(0.01)
+    assert await loader.load(6) == "user6"
+    assert calls[-1] == [6]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_only_fails_its_own_loads() -> None:
+    gate = asyncio.Event()
+    attempts = 0
+
+    async def batch(keys: list[int]) -> dict[int, str]:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            await gate.wait()
+            raise ConnectionError("db went away")
+        return {key: f"user{key}" for key in keys}
+
+    loader: DataLoader[int, str] = DataLoader(batch)
+    first = loader.load(1)
+    await asyncio.sleep(0)  # first batch is now in flight
+    first.cancel()
+    second = loader.load(1)  # queued for a second batch
+    await asyncio.sleep(0)
+    gate.set()
+    # the first batch's failure must not reach the re-issued load
+    assert await second == "user1"
+    assert attempts == 2
@@ -0,0 +1,67 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.db.pool import InstrumentedAsyncQueuePool, instrument_pool
+from app.db.session import ReadOnlySession
+from app.models.user import User
+
+
+def _sample(name: str, label: str) -> float:
+    return REGISTRY.get_sample_value(name, {"pool": label}) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_track_checkout_and_exhaustion(tmp_path) -> None:
+    label = "test_pool"
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    instrument_pool(engine.sync_engine.pool, label)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert _sample("db_pool_checked_out", label) == 1
+            assert _sample("db_pool_connects_total", label) == 1
+
+            # the only slot is taken: the next checkout must time out
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+            assert _sample("db_pool_timeouts_total", label) == 1
+
+        assert _sample("db_pool_checked_out", label) == 0
+        assert _sample("db_pool_checkout_wait_seconds_count", label) == 2
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_releases_connection(tmp_path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ro.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    make_session = async_sessionmaker(
+        bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=ReadOnlySession,
+        expire_on_commit=False,
+    )
+    try:
+        async with make_session() as session:
+            result = await session.execute(text("SELECT 1"))
+            assert result.scalar_one() == 1
+            # no transaction left open, connection already back in the pool
+            assert not session.in_transaction()
+            assert engine.sync_engine.pool.checkedout() == 0
+
+            session.add(User(email="ro@example.com", hashed_password="x"))
+            with pytest.raises(exc.InvalidRequestError):
+                await session.flush()
+    finally:
+        await engine.dispose()
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import sys
+
+from app.core.metrics import render_latest
+
+# Each snippet runs in its own interpreter, like a separate uvicorn worker.
+_WORKER = """
+from app.core.metrics import CACHE_HITS, REQUESTS_IN_PROGRESS
+CACHE_HITS.labels("mp_test").inc(3)
+REQUESTS_IN_PROGRESS.labels("GET").inc()
+"""
+_EXITING_WORKER = _WORKER + """
+from app.core.metrics import mark_worker_dead
+mark_worker_dead()
+"""
+_SCRAPER = """
+from app.core.metrics import render_latest
+print(render_latest().decode())
+"""
+
+
+def _run(code: str, env: dict[str, str]) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def test_render_latest_single_process() -> None:
+    assert b"http_request_duration_seconds" in render_latest()
+
+
+def test_multiprocess_metrics_are_aggregated(tmp_path) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    _run(_WORKER, env)
+    _run(_EXITING_WORKER, env)
+
+    output = _run(_SCRAPER, env)
+    assert 'cache_hits_total{cache="mp_test"} 6.0' in output
+    # the exited worker's live gauge is gone, the other one still counts
+    assert 'http_requests_in_progress{method="GET"} 1.0' in output
+
+
+def test_dead_worker_gauges_do_not_linger(tmp_path) -> None:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    # an exiting worker saw the replica lagging and unhealthy...
+    _run(
+        """
+from app.core.metrics import DB_REPLICA_HEALTHY, DB_REPLICA_LAG_SECONDS
+from app.core.metrics import EVENT_LOOP_LAG_SECONDS
+DB_REPLICA_LAG_SECONDS.labels("r0").set(60)
+DB_REPLICA_HEALTHY.labels("r0").set(0)
+EVENT_LOOP_LAG_SECONDS.set(3)
+from app.core.metrics import mark_worker_dead
+mark_worker_dead()
+""",
+        env,
+    )
+    # ...the live one sees it caught up
+    _run(
+        """
+from app.core.metrics import DB_REPLICA_HEALTHY, DB_REPLICA_LAG_SECONDS
+from app.core.metrics import EVENT_LOOP_LAG_SECONDS
+DB_REPLICA_LAG_SECONDS.labels("r0").set(1)
+DB_REPLICA_HEALTHY.labels("r0").set(1)
+EVENT_LOOP_LAG_SECONDS.set(0.01)
+""",
+        env,
+    )
+
+    output = _run(_SCRAPER, env)
+    assert 'db_replica_lag_seconds{replica="r0"} 1.0' in output
+    assert 'db_replica_healthy{replica="r0"} 1.0' in output
+    assert "event_loop_lag_seconds 0.01" in output
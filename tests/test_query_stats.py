@@ -0,0 +1,110 @@
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.query_stats import finish_request, fingerprint, start_request
+from app.models.user import User
+from tests.conftest import TEST_PASSWORD, login
+
+
+def test_fingerprint_folds_literals_and_in_lists() -> None:
+    assert fingerprint("SELECT *\n  FROM users WHERE id IN (?, ?, ?)") == (
+        fingerprint("SELECT * FROM users WHERE id IN (?)")
+    )
+    assert fingerprint("SELECT 1 FROM t WHERE a = 'x' AND b = $1") == (
+        "SELECT ? FROM t WHERE a = ? AND b = ?"
+    )
+    assert fingerprint("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == (
+        "INSERT INTO t (a, b) VALUES (?)"
+    )
+    # PostgreSQL (asyncpg): typed binds, so every batch size is one label
+    two_rows = (
+        "INSERT INTO t (a, b, c) VALUES ($1::VARCHAR, $2::BOOLEAN, "
+        "$3::TIMESTAMP WITH TIME ZONE), ($4::VARCHAR, $5::BOOLEAN, "
+        "$6::TIMESTAMP WITH TIME ZONE) ON CONFLICT (a) DO NOTHING"
+    )
+    one_row = (
+        "INSERT INTO t (a, b, c) VALUES ($1::VARCHAR, $2::BOOLEAN, "
+        "$3::TIMESTAMP WITH TIME ZONE) ON CONFLICT (a) DO NOTHING"
+    )
+    assert fingerprint(two_rows) == fingerprint(one_row) == (
+        "INSERT INTO t (a, b, c) VALUES (?) ON CONFLICT (a) DO NOTHING"
+    )
+    assert fingerprint("SELECT a FROM t WHERE id = ANY($1::INTEGER[])") == (
+        "SELECT a FROM t WHERE id = ANY(?)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_endpoint_statement_budgets(client: AsyncClient, query_budget) -> None:
+    with query_budget(1):
+        created = await client.post(
+            "/api/v1/users",
+            json={"email": "budget@example.com", "password": TEST_PASSWORD},
+        )
+    headers = await login(client, "budget_auth@example.com")
+
+    # principal lookup + the user itself
+    with query_budget(2):
+        await client.get(f"/api/v1/users/{created.json()['id']}", headers=headers)
+    # principal is cached now; one page query carries the total too
+    with query_budget(1):
+        await client.get("/api/v1/users?limit=50", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_debug_headers(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    headers = await login(client, "debug_headers@example.com")
+    response = await client.get("/api/v1/users/me", headers=headers)
+    assert "X-DB-Query-Count" not in response.headers
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    response = await client.get("/api/v1/users?limit=5", headers=headers)
+    assert response.headers["X-DB-Query-Count"] == "1"
+    assert float(response.headers["X-DB-Query-Time-Ms"]) >= 0
+    assert response.headers["X-DB-Repeated-Queries"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_are_logged(
+    db_session: AsyncSession, caplog: pytest.LogCaptureFixture
+) -> None:
+    stats, token = start_request()
+    for user_id in range(settings.DB_QUERY_REPEAT_THRESHOLD):
+        await db_session.execute(
+            text("SELECT id FROM users WHERE id = :id"), {"id": user_id}
+        )
+    with caplog.at_level(logging.WARNING, logger="app"):
+        assert finish_request(token, "/test") is stats
+    assert stats.count == settings.DB_QUERY_REPEAT_THRESHOLD
+    assert "possible N+1" in caplog.text
+
+    # finished: later statements in this context are no longer tracked
+    await db_session.execute(text("SELECT 1"))
+    assert stats.count == settings.DB_QUERY_REPEAT_THRESHOLD
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged_redacted(
+    db_session: AsyncSession,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_SECONDS", 1e-9)
+    with caplog.at_level(logging.WARNING, logger="app"):
+        await db_session.execute(
+            update(User)
+            .where(User.email == "slow@example.com")
+            .values(hashed_password="s3cret-hash", full_name="Slow")
+        )
+    record = next(r for r in caplog.records if r.msg.startswith("Slow query"))
+    assert record.statement.startswith("UPDATE users SET hashed_password=?")
+    assert record.parameters["hashed_password"] == "<redacted>"
+    assert record.parameters["full_name"] == "Slow"
+    assert "s3cret-hash" not in caplog.text
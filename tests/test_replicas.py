@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db import session as db_session_module
+from app.db.replicas import (
+    Replica,
+    ReplicaSet,
+    mark_recent_write,
+    prefer_primary,
+    wrote_recently,
+)
+from app.db.session import ReadOnlySession
+
+
+def _engine(path) -> AsyncEngine:
+    return create_async_engine(f"sqlite+aiosqlite:///{path}").execution_options(
+        isolation_level="AUTOCOMMIT"
+    )
+
+
+async def _tag(engine: AsyncEngine, name: str) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("CREATE TABLE tag (name TEXT)"))
+        await conn.execute(text(f"INSERT INTO tag VALUES ('{name}')"))
+
+
+@pytest.mark.asyncio
+async def test_round_robin_skips_unhealthy(tmp_path) -> None:
+    a = Replica("a", _engine(tmp_path / "a.db"))
+    b = Replica("b", _engine(tmp_path / "b.db"))
+    replica_set = ReplicaSet([a, b], strategy="round_robin", max_lag=5)
+    assert {replica_set.choose().name for _ in range(4)} == {"a", "b"}
+
+    b.healthy = False
+    assert {replica_set.choose().name for _ in range(4)} == {"a"}
+
+    # SQLite has no pg_last_wal_* functions, so the probe fails for both
+    await replica_set.check()
+    assert replica_set.choose() is None
+    await a.engine.dispose()
+    await b.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_routes_to_replica(tmp_path, monkeypatch) -> None:
+    primary = _engine(tmp_path / "primary.db")
+    replica = _engine(tmp_path / "replica.db")
+    await _tag(primary, "primary")
+    await _tag(replica, "replica")
+    monkeypatch.setattr(
+        db_session_module,
+        "replicas",
+        ReplicaSet(
+            [Replica("r", replica)], strategy="least_connections", max_lag=5
+        ),
+    )
+    make_session = async_sessionmaker(bind=primary, class_=ReadOnlySession)
+    query = text("SELECT name FROM tag")
+    try:
+        async with make_session() as session:
+            assert (await session.execute(query)).scalar_one() == "replica"
+            prefer_primary()
+            assert (await session.execute(query)).scalar_one() == "primary"
+    finally:
+        await primary.dispose()
+        await replica.dispose()
+
+
+def test_recent_writers_are_pinned() -> None:
+    assert not wrote_recently(987654)
+    mark_recent_write(987654, None)
+    assert wrote_recently(987654)
@@ -0,0 +1,34 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import FastJSONResponse
+from app.schemas.user import UserPage, UserRead
+
+
+def _user(user_id: int) -> UserRead:
+    now = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    return UserRead(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        full_name="Ünïcode Name",
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_model_render_matches_default_encoding() -> None:
+    page = UserPage(
+        items=[_user(i) for i in range(3)], total=3, limit=20, offset=0
+    )
+    body = FastJSONResponse(page).body
+    assert json.loads(body) == jsonable_encoder(page)
+
+
+def test_plain_content_still_renders() -> None:
+    response = FastJSONResponse({"detail": "nope"}, status_code=404)
+    assert response.body == b'{"detail":"nope"}'
+    assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableException
+from app.core.executor import BoundedExecutor
+from app.core.security import (
+    hash_password,
+    hash_password_async,
+    hash_passwords_async,
+    verify_password,
+    verify_password_async,
+)
+from tests.conftest import TEST_PASSWORD, TEST_PASSWORD_ALT
+
+
+@pytest.mark.asyncio
+async def test_async_hash_roundtrip() -> None:
+    hashed = await hash_password_async(TEST_PASSWORD)
+    assert verify_password(TEST_PASSWORD, hashed)
+    assert await verify_password_async(TEST_PASSWORD, hash_password(TEST_PASSWORD))
+    assert not await verify_password_async(TEST_PASSWORD_ALT, hashed)
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_rejects_when_queue_full() -> None:
+    pool = BoundedExecutor("test_pool", max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        running = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        queued = asyncio.create_task(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.01)
+        assert pool.pending == 1
+
+        with pytest.raises(ServiceUnavailableException):
+            await pool.run(lambda: "rejected")
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_passwords_async_keeps_order() -> None:
+    passwords = [f"{TEST_PASSWORD}{i}" for i in range(5)]
+    hashed = await hash_passwords_async(passwords, chunk_size=2)
+    assert len(hashed) == 5
+    assert all(verify_password(p, h) for p, h in zip(passwords, hashed))
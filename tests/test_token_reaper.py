@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import hash_refresh_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.token_reaper import reap_refresh_tokens
+
+
+@pytest.mark.asyncio
+async def test_reaper_deletes_only_dead_tokens(db_session: AsyncSession) -> None:
+    user = User(email="reaper@example.com", hashed_password="x")
+    db_session.add(user)
+    await db_session.flush()
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {"expires_at": now - timedelta(days=1), "revoked": False},
+        {"expires_at": now - timedelta(days=2), "revoked": False},
+        {"expires_at": now + timedelta(days=1), "revoked": True},
+        {"expires_at": now + timedelta(days=1), "revoked": False},
+    ]
+    await db_session.execute(
+        insert(RefreshToken),
+        [
+            {"user_id": user.id, "token_hash": hash_refresh_token(str(i)), **row}
+            for i, row in enumerate(rows)
+        ],
+    )
+
+    # share the test connection so the outer rollback still isolates the test
+    def session_factory() -> AsyncSession:
+        return AsyncSession(bind=db_session.bind, expire_on_commit=False)
+
+    deleted = await reap_refresh_tokens(session_factory, batch_size=2, batch_delay=0)
+    assert deleted == 3
+
+    remaining = (
+        await db_session.execute(
+            select(func.count())
+            .select_from(RefreshToken)
+            .where(RefreshToken.user_id == user.id)
+        )
+    ).scalar_one()
+    assert remaining == 1
@@ -1,6 +1,9 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 
+from app.core.config import settings
 from tests.conftest import TEST_PASSWORD
 
 
@@ -78,6 +81,42 @@ async def test_list_users_with_auth(client: AsyncClient) -> None:
     assert "offset" in data
 
 
+@pytest.mark.asyncio
+async def test_list_users_cursor_mode(client: AsyncClient) -> None:
+    for i in range(3):
+        await client.post(
+            "/api/v1/users",
+            json={"email": f"cursor{i}_ep@example.com", "password": TEST_PASSWORD},
+        )
+    token_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "cursor0_ep@example.com", "password": TEST_PASSWORD},
+    )
+    headers = {"Authorization": f"Bearer {token_response.json()['access_token']}"}
+
+    first = await client.get("/api/v1/users?page=1&limit=2", headers=headers)
+    assert first.status_code == 200
+    cursor = first.json()["next_cursor"]
+    assert cursor
+
+    second = await client.get(
+        f"/api/v1/users?limit=2&cursor={cursor}", headers=headers
+    )
+    assert second.status_code == 200
+    data = second.json()
+    assert data["total"] is None
+    first_ids = [u["id"] for u in first.json()["items"]]
+    assert all(u["id"] > max(first_ids) for u in data["items"])
+
+    counted = await client.get(
+        f"/api/v1/users?limit=2&cursor={cursor}&count=estimated", headers=headers
+    )
+    assert counted.json()["total"] == first.json()["total"]
+
+    bad = await client.get("/api/v1/users?cursor=%%%", headers=headers)
+    assert bad.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_delete_user_with_auth(client: AsyncClient) -> None:
     create_resp = await client.post(
@@ -140,6 +179,27 @@ async def test_metrics_endpoint(client: AsyncClient) -> None:
     assert "http_request_duration_seconds" in response.text
 
 
+@pytest.mark.asyncio
+async def test_metrics_use_route_template(client: AsyncClient) -> None:
+    await client.get("/api/v1/users/424242")
+    response = await client.get("/metrics")
+    assert 'path="/api/v1/users/{user_id}"' in response.text
+    assert "/api/v1/users/424242" not in response.text
+    assert "http_requests_in_progress" in response.text
+    assert "http_response_size_bytes" in response.text
+
+
+@pytest.mark.asyncio
+async def test_response_headers_injected(client: AsyncClient) -> None:
+    first = await client.get("/health")
+    second = await client.get("/health")
+    assert first.headers["X-Request-ID"] != second.headers["X-Request-ID"]
+    assert first.headers["X-Frame-Options"] == "DENY"
+    assert first.headers["X-Content-Type-Options"] == "nosniff"
+    assert "Strict-Transport-Security" in first.headers
+    assert first.headers["Referrer-Policy"] == "same-origin"
+
+
 @pytest.mark.asyncio
 async def test_health_endpoint(client: AsyncClient) -> None:
     response = await client.get("/health")
@@ -147,3 +207,161 @@ async def test_health_endpoint(client: AsyncClient) -> None:
     data = response.json()
     assert data["status"] == "ok"
     assert data["database"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_export_users_streams_ndjson_and_csv(
+    client: AsyncClient, monkeypatch
+) -> None:
+    for i in range(5):
+        await client.post(
+            "/api/v1/users",
+            json={"email": f"export_{i}@example.com", "password": TEST_PASSWORD},
+        )
+    token_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "export_0@example.com", "password": TEST_PASSWORD},
+    )
+    headers = {"Authorization": f"Bearer {token_response.json()['access_token']}"}
+    # several cursor batches per export
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+
+    response = await client.get("/api/v1/users/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    emails = [row["email"] for row in rows]
+    assert [f"export_{i}@example.com" for i in range(5)] == [
+        e for e in emails if e.startswith("export_")
+    ]
+    assert "hashed_password" not in rows[0]
+
+    response = await client.get(
+        "/api/v1/users/export", params={"format": "csv"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.splitlines()
+    assert lines[0].split(",")[:2] == ["id", "email"]
+    assert len(lines) == len(rows) + 1
+
+    response = await client.get("/api/v1/users/export")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_reports_each_line(client: AsyncClient) -> None:
+    await client.post(
+        "/api/v1/users",
+        json={"email": "bulk_admin@example.com", "password": TEST_PASSWORD},
+    )
+    token_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "bulk_admin@example.com", "password": TEST_PASSWORD},
+    )
+    headers = {"Authorization": f"Bearer {token_response.json()['access_token']}"}
+    lines = [
+        json.dumps({"email": "bulk_1@example.com", "password": TEST_PASSWORD}),
+        json.dumps({"email": "bulk_admin@example.com", "password": TEST_PASSWORD}),
+        "",
+        json.dumps({"email": "not-an-email", "password": TEST_PASSWORD}),
+        json.dumps({"email": "bulk_1@example.com", "password": TEST_PASSWORD}),
+        json.dumps({"email": "bulk_2@example.com", "password": TEST_PASSWORD}),
+    ]
+
+    response = await client.post(
+        "/api/v1/users/bulk",
+        content="\n".join(lines).encode(),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["conflicts"], report["invalid"]) == (2, 2, 1)
+    assert [(r["line"], r["status"]) for r in report["results"]] == [
+        (1, "created"),
+        (2, "conflict"),
+        (4, "invalid"),
+        (5, "conflict"),
+        (6, "created"),
+    ]
+    assert report["results"][3]["email"] == "bulk_1@example.com"
+    assert report["results"][2]["error"].startswith("email:")
+
+    # imported users can log in
+    login = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "bulk_2@example.com", "password": TEST_PASSWORD},
+    )
+    assert login.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_row_cap(client: AsyncClient, monkeypatch) -> None:
+    await client.post(
+        "/api/v1/users",
+        json={"email": "bulk_cap@example.com", "password": TEST_PASSWORD},
+    )
+    token_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "bulk_cap@example.com", "password": TEST_PASSWORD},
+    )
+    headers = {"Authorization": f"Bearer {token_response.json()['access_token']}"}
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_ROWS", 2)
+    body = "\n".join(
+        json.dumps({"email": f"cap_{i}@example.com", "password": TEST_PASSWORD})
+        for i in range(3)
+    )
+    response = await client.post("/api/v1/users/bulk", content=body, headers=headers)
+    assert response.status_code == 413
+
+    # no newline at all: the line cap trips while the body streams in
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_LINE_BYTES", 64)
+
+    async def unterminated():
+        for _ in range(100):
+            yield b"x" * 16
+
+    response = await client.post(
+        "/api/v1/users/bulk", content=unterminated(), headers=headers
+    )
+    assert response.status_code == 413
+    assert "Line exceeds" in response.json()["detail"]
+
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_LINE_BYTES", 8_192)
+    monkeypatch.setattr(settings, "BULK_IMPORT_MAX_BODY_BYTES", 100)
+    response = await client.post(
+        "/api/v1/users/bulk", content=(b"{}\n" * 50), headers=headers
+    )
+    assert response.status_code == 413
+    assert "Body exceeds" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_list_users_by_ids(client: AsyncClient) -> None:
+    ids = []
+    for i in range(3):
+        response = await client.post(
+            "/api/v1/users",
+            json={"email": f"batch_{i}@example.com", "password": TEST_PASSWORD},
+        )
+        ids.append(response.json()["id"])
+    token_response = await client.post(
+        "/api/v1/auth/token",
+        data={"username": "batch_0@example.com", "password": TEST_PASSWORD},
+    )
+    headers = {"Authorization": f"Bearer {token_response.json()['access_token']}"}
+
+    wanted = [ids[2], 999999, ids[0], ids[2]]
+    response = await client.get(
+        "/api/v1/users", params={"ids": wanted}, headers=headers
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert [u["id"] for u in page["items"]] == [ids[2], ids[0]]
+    assert page["total"] == 2
+
+    response = await client.get(
+        "/api/v1/users", params={"ids": list(range(1, 102))}, headers=headers
+    )
+    assert response.status_code == 422
@@ -1,11 +1,16 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import principal_cache
 from app.core.exceptions import ConflictException, NotFoundException
 from app.schemas.user import UserCreate, UserUpdate
 from app.services.user_service import UserService
 from app.models.user import User
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.repositories.user_repository import UserRepository
 from tests.conftest import TEST_PASSWORD
 
 
@@ -52,6 +57,41 @@ async def test_update_user(db_session: AsyncSession) -> None:
     assert updated.full_name == "Updated Name"
 
 
+@pytest.mark.asyncio
+async def test_update_user_missing_or_conflicting(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    taken = await service.create_user(
+        UserCreate(email="taken_svc@example.com", password=TEST_PASSWORD)
+    )
+    with pytest.raises(NotFoundException):
+        await service.update_user(99999, UserUpdate(full_name="Nobody"))
+    with pytest.raises(NotFoundException):
+        await service.delete_user(99999)
+
+    other = await service.create_user(
+        UserCreate(email="other_svc@example.com", password=TEST_PASSWORD)
+    )
+    with pytest.raises(ConflictException):
+        await service.update_user(other.id, UserUpdate(email=taken.email))
+
+
+@pytest.mark.asyncio
+async def test_update_user_invalidates_principal_after_commit(
+    db_session: AsyncSession,
+) -> None:
+    service = UserService(db_session)
+    created = await service.create_user(
+        UserCreate(email="stale_svc@example.com", password=TEST_PASSWORD)
+    )
+    await service.update_user(created.id, UserUpdate(is_active=False))
+    assert principal_cache.get(created.id) is None
+    # a concurrent request re-caches the pre-commit row...
+    principal_cache.set(created.id, {"id": created.id, "is_active": True})
+    await db_session.commit()
+    # ...and the commit drops it again
+    assert principal_cache.get(created.id) is None
+
+
 @pytest.mark.asyncio
 async def test_delete_user(db_session: AsyncSession) -> None:
     service = UserService(db_session)
@@ -84,11 +124,12 @@ async def test_create_user_race_condition(db_session: AsyncSession) -> None:
     # first create succeeds
     await service.create_user(data)
 
-    # simulate race by bypassing the email check in service
-    async def no_check(email: str):
-        return None
+    # there is no look-before-insert to race past: the unique index decides
+    # inside the INSERT itself
+    async def fail(email: str):
+        raise AssertionError("create_user must not pre-check the email")
 
-    service.repo.get_by_email = no_check  # type: ignore
+    service.repo.get_by_email = fail  # type: ignore
 
     with pytest.raises(ConflictException):
         await service.create_user(data)
@@ -98,3 +139,153 @@ async def test_create_user_race_condition(db_session: AsyncSession) -> None:
         select(func.count()).select_from(User).where(User.email == data.email)
     )
     assert result.scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_list_users_keyset_walks_all_pages(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    created = set()
+    for i in range(5):
+        user = await service.create_user(
+            UserCreate(email=f"keyset{i}_svc@example.com", password=TEST_PASSWORD)
+        )
+        created.add(user.id)
+
+    seen: list[int] = []
+    cursor = None
+    while True:
+        page = await service.list_users_after(cursor, limit=2)
+        assert page.total is None
+        assert len(page.items) <= 2
+        seen.extend(u.id for u in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == sorted(seen)
+    assert created <= set(seen)
+
+
+@pytest.mark.asyncio
+async def test_list_users_keyset_invalid_cursor(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    with pytest.raises(ValueError):
+        await service.list_users_after("not-a-cursor", limit=2)
+
+
+@pytest.mark.asyncio
+async def test_list_users_total_matches_count(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    for i in range(3):
+        await service.create_user(
+            UserCreate(email=f"window{i}_svc@example.com", password=TEST_PASSWORD)
+        )
+    expected = (
+        await db_session.execute(select(func.count()).select_from(User))
+    ).scalar_one()
+
+    page = await service.list_users(limit=2, offset=0)
+    assert page.total == expected
+    assert len(page.items) == 2
+
+    # past the last page the total must still be reported
+    empty = await service.list_users(limit=2, offset=expected + 10)
+    assert empty.items == []
+    assert empty.total == expected
+
+
+@pytest.mark.asyncio
+async def test_list_users_count_modes(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    await service.create_user(
+        UserCreate(email="count1_svc@example.com", password=TEST_PASSWORD)
+    )
+    exact = await service.list_users(limit=10, count="exact")
+    # SQLite has no planner statistics, so the estimate falls back to exact
+    estimated = await service.list_users(limit=10, count="estimated")
+    assert estimated.total == exact.total
+
+    cached = await service.list_users(limit=10, count="cached")
+    assert cached.total == exact.total
+    await service.create_user(
+        UserCreate(email="count2_svc@example.com", password=TEST_PASSWORD)
+    )
+    # served from cache until the TTL expires
+    assert (await service.list_users(limit=10, count="cached")).total == exact.total
+    assert (await service.list_users(limit=10)).total == exact.total + 1
+
+
+@pytest.mark.asyncio
+async def test_list_users_reads_plain_rows(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    for i in range(3):
+        await service.create_user(
+            UserCreate(email=f"proj_{i}@example.com", password=TEST_PASSWORD)
+        )
+    db_session.expunge_all()
+
+    page = await service.list_users(limit=100)
+    cursor_page = await service.list_users_after(None, limit=100)
+
+    # projected rows: nothing was loaded into the identity map
+    assert len(db_session.identity_map) == 0
+    emails = {u.email for u in page.items}
+    assert {f"proj_{i}@example.com" for i in range(3)} <= emails
+    assert [u.id for u in cursor_page.items] == [u.id for u in page.items]
+    assert "hashed_password" not in page.items[0].model_dump()
+
+
+@pytest.mark.asyncio
+async def test_repository_batch_lookups(db_session: AsyncSession) -> None:
+    service = UserService(db_session)
+    created = [
+        await service.create_user(
+            UserCreate(email=f"many_{i}@example.com", password=TEST_PASSWORD)
+        )
+        for i in range(3)
+    ]
+    repo = UserRepository(db_session)
+
+    by_id = await repo.get_many_by_ids([created[0].id, created[2].id, 999999])
+    assert {u.email for u in by_id} == {"many_0@example.com", "many_2@example.com"}
+    by_email = await repo.get_many_by_emails(["many_1@example.com", "nobody@x.io"])
+    assert [u.id for u in by_email] == [created[1].id]
+    assert await repo.get_many_by_ids([]) == []
+
+
+@pytest.mark.asyncio
+async def test_repository_writes_are_single_statements(
+    db_session: AsyncSession, query_budget
+) -> None:
+    repo = UserRepository(db_session)
+    with query_budget(1):
+        row = await repo.insert_returning(
+            {"email": "stmt_count@example.com", "hashed_password": "x"}
+        )
+    assert row.id and row.created_at and row.updated_at
+    with query_budget(1):
+        row = await repo.update_returning(row.id, {"full_name": "Counted"})
+    assert row.full_name == "Counted"
+    with query_budget(1):
+        await RefreshTokenRepository(db_session).create(
+            row.id, "f" * 64, datetime.now(timezone.utc) + timedelta(days=1)
+        )
+    with query_budget(1):
+        assert await repo.delete_returning(row.id)
+
+
+@pytest.mark.asyncio
+async def test_orm_writes_fetch_server_defaults_with_returning(
+    db_session: AsyncSession, query_budget
+) -> None:
+    # the path the admin panel takes: add/modify, then flush
+    user = User(email="orm_defaults@example.com", hashed_password="x")
+    with query_budget(1):
+        db_session.add(user)
+        await db_session.flush()
+        # arrived with the INSERT: no refresh, no lazy load
+        assert user.id and user.created_at and user.updated_at
+    with query_budget(1):
+        user.full_name = "Flushed"
+        await db_session.flush()
+        assert user.updated_at is not None